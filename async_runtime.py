@@ -0,0 +1,194 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Async Runtime - spoločný asyncio loop pre coroutine logiku ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Moduly s "async def logic_main_init(stop_event)" alebo "async def main()" nebežia vo
+# vlastnom vlákne, ale ako úlohy na jednom zdieľanom asyncio loope v samostatnom vlákne.
+# stop_event je AsyncStopEvent: funguje ako threading.Event a navyše sa dá "await"-núť:
+#
+#     async def logic_main_init(stop_event):
+#         while not stop_event.is_set():
+#             ...
+#             await stop_event.wait(timeout=1.0)
+
+import asyncio
+import inspect
+import threading
+import traceback
+import concurrent.futures
+
+# ////---- Konštanty ----////
+CANCEL_GRACE = 1.0  # koľko sekúnd po stop_event čakáme pred zrušením (cancel) úloh
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Detekcia coroutine logiky ----////
+def is_async_logic(logic):
+    entry = getattr(logic, "logic_main_init", None) or getattr(logic, "main", None)
+    return inspect.iscoroutinefunction(entry)
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- AsyncStopEvent - threading.Event s awaitable wait() ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class AsyncStopEvent:
+    def __init__(self, loop):
+        self._loop = loop
+        self._flag = threading.Event()
+        self._async_event = None  # vytvorí sa až v loope (staršie Pythony viažu Event na loop)
+
+    def _get_async_event(self):
+        if self._async_event is None:
+            self._async_event = asyncio.Event()
+            if self._flag.is_set():
+                self._async_event.set()
+        return self._async_event
+
+    def _set_async_event(self):
+        if self._async_event is not None:
+            self._async_event.set()
+
+    def set(self):
+        # set() sa volá z GUI/hlavného vlákna, asyncio.Event sa smie meniť iba z loopu
+        self._flag.set()
+        try:
+            self._loop.call_soon_threadsafe(self._set_async_event)
+        except RuntimeError:
+            pass  # loop už je zatvorený
+
+    def is_set(self):
+        return self._flag.is_set()
+
+    async def wait(self, timeout=None):
+        """Počká na stop signál, vráti True ak bol nastavený."""
+        event = self._get_async_event()
+        if timeout is None:
+            await event.wait()
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._flag.is_set()
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- AsyncJob - handle s rovnakým rozhraním ako threading.Thread ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class AsyncJob:
+    def __init__(self, runtime, module_name, logic, stop_event):
+        self.name = module_name
+        self.logic = logic
+        self.stop_event = stop_event
+        self._runtime = runtime
+        self.future = None  # concurrent.futures.Future z run_coroutine_threadsafe
+        self.task = None    # asyncio.Task v zdieľanom loope
+
+    # ////---- Rozhranie ako threading.Thread ----////
+    def start(self):
+        self.future = asyncio.run_coroutine_threadsafe(self._run(), self._runtime.loop)
+
+    def is_alive(self):
+        return self.future is not None and not self.future.done()
+
+    def join(self, timeout=None):
+        if self.future is None:
+            return
+        try:
+            self.future.result(timeout)
+        except (concurrent.futures.TimeoutError, concurrent.futures.CancelledError):
+            pass
+
+    def cancel(self):
+        # Volá sa z iného vlákna (shutdown) - Task sa smie zrušiť iba v loope
+        if self.task is not None:
+            try:
+                self._runtime.loop.call_soon_threadsafe(self.task.cancel)
+            except RuntimeError:
+                pass  # loop už je zatvorený
+        elif self.future is not None:
+            self.future.cancel()  # coroutine ešte nezačala - zruší sa pred spustením
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Samotná coroutine modulu ----////
+    async def _run(self):
+        self.task = asyncio.current_task()
+        try:
+            if hasattr(self.logic, "logic_main_init"):
+                await self.logic.logic_main_init(stop_event=self.stop_event)
+            else:
+                await self.logic.main()
+        except asyncio.CancelledError:
+            print(f"[AsyncRuntime] Logika {self.name} bola zrušená")
+            raise
+        except Exception as e:
+            print(f"Chyba pri spustení async logiky {self.name}: {e}")
+            traceback.print_exc()
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- AsyncRuntime ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class AsyncRuntime:
+    # ////---- Inicializácia ----////
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._jobs = []
+        self._thread = threading.Thread(target=self._run_loop, name="logic-asyncio", daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Registrácia modulu ----////
+    def create_stop_event(self):
+        return AsyncStopEvent(self.loop)
+
+    def create_job(self, module_name, logic, stop_event):
+        job = AsyncJob(self, module_name, logic, stop_event)
+        self._jobs.append(job)
+        return job
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zastavenie - stop signál, krátka milosť, potom cancel ----////
+    def stop(self, grace=CANCEL_GRACE):
+        for job in self._jobs:
+            job.stop_event.set()
+        pending = [job.future for job in self._jobs if job.is_alive()]
+        if pending:
+            concurrent.futures.wait(pending, timeout=grace)
+        if any(job.is_alive() for job in self._jobs):
+            try:
+                asyncio.run_coroutine_threadsafe(self._cancel_all(grace), self.loop).result(grace + 0.5)
+            except Exception as e:
+                print(f"[AsyncRuntime] Chyba pri rušení úloh: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=grace)
+        self._jobs.clear()
+
+    async def _cancel_all(self, grace):
+        # Beží v loope: zruší úlohy, ktoré nereagovali na stop_event, a počká na ich ukončenie
+        tasks = [job.task for job in self._jobs if job.task is not None and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=grace)
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_runtime_instance = None
+
+def get_async_runtime():
+    global _runtime_instance
+    if _runtime_instance is None:
+        _runtime_instance = AsyncRuntime()
+    return _runtime_instance
+
+def stop_async_runtime(grace=CANCEL_GRACE):
+    global _runtime_instance
+    if _runtime_instance:
+        _runtime_instance.stop(grace)
+        _runtime_instance = None
+# ////-----------------------------------------------------------------------------------------
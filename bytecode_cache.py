@@ -0,0 +1,128 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Bytecode Cache - .pyc cache pre logiku, widgety a overlaye modulov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Súbory modulov sa načítavajú dynamicky (spec_from_file_location + exec). V skompilovanej
+# distribúcii sú modules/ obyčajné zdrojáky, takže by sa pri každom štarte znova kompilovali.
+# Tu si vedieme vlastnú hash-validovanú .pyc cache v __pycache__ vedľa zdroja (formát PEP 552,
+# rovnaký ako "compileall --invalidation-mode checked-hash"), nezávisle od sys.dont_write_bytecode.
+#
+# Predkompilácia pri builde:  python bytecode_cache.py <cesta k modules>
+
+import os
+import sys
+import marshal
+import importlib.util
+
+# ////---- Konštanty ----////
+_PYC_FLAGS_CHECKED_HASH = (0b11).to_bytes(4, "little")  # hash-based + check_source
+_HEADER_SIZE = 16  # magic (4) + flags (4) + source hash (8)
+_loaded_names = set()  # mená modulov, ktoré sme sami zaregistrovali do sys.modules
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Pomocné funkcie ----////
+def _cache_path(file_path):
+    try:
+        return importlib.util.cache_from_source(file_path)
+    except NotImplementedError:
+        return None  # interpreter bez cache_tag - .pyc cache nepoužívame
+
+def _write_pyc(cache_path, code, source_hash):
+    data = importlib.util.MAGIC_NUMBER + _PYC_FLAGS_CHECKED_HASH + source_hash + marshal.dumps(code)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)  # atomicky, súbežné štarty si nepoškodia cache
+    except OSError:
+        # Read-only inštalácia - cache jednoducho nepoužijeme
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Verejné API ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+
+# ////---- Kód zo súboru - z cache, ak sedí hash zdroja ----////
+def get_code(file_path):
+    with open(file_path, "rb") as f:
+        source = f.read()
+    source_hash = importlib.util.source_hash(source)
+    cache_path = _cache_path(file_path)
+
+    if cache_path:
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+            if (data[:4] == importlib.util.MAGIC_NUMBER
+                    and data[4:8] == _PYC_FLAGS_CHECKED_HASH
+                    and data[8:16] == source_hash):
+                return marshal.loads(data[_HEADER_SIZE:])
+        except (OSError, ValueError, EOFError, TypeError):
+            pass  # chýbajúca alebo poškodená cache -> prekompilujeme
+
+    code = compile(source, file_path, "exec", dont_inherit=True)
+    if cache_path:
+        _write_pyc(cache_path, code, source_hash)
+    return code
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Načítanie súboru ako modul s unikátnym menom ----////
+def load_source_module(module_name, file_path, register=True):
+    """Ekvivalent spec_from_file_location + exec_module, ale s .pyc cache."""
+    spec = importlib.util.spec_from_file_location(module_name, file_path)
+    module = importlib.util.module_from_spec(spec)
+    if register:
+        sys.modules[module_name] = module
+        _loaded_names.add(module_name)
+    try:
+        exec(get_code(file_path), module.__dict__)
+    except BaseException:
+        if register:
+            sys.modules.pop(module_name, None)
+            _loaded_names.discard(module_name)
+        raise
+    return module
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Odstránenie načítaných súborov jedného modulu zo sys.modules (hot reload) ----////
+def unload_modules(module_name):
+    # Mažeme iba mená, ktoré sme načítali my - nie napr. "json.decoder" pre modul "json"
+    prefix = f"{module_name}."
+    for name in [n for n in _loaded_names if n.startswith(prefix)]:
+        sys.modules.pop(name, None)
+        _loaded_names.discard(name)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Mená modulov načítaných cez load_source_module ----////
+def loaded_module_names():
+    return set(_loaded_names)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Predkompilácia všetkých modulov (krok buildu) ----////
+def precompile_modules(modules_dir="modules"):
+    count, failed = 0, 0
+    for root, dirs, files in os.walk(modules_dir):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for fname in files:
+            if not fname.endswith(".py"):
+                continue
+            path = os.path.join(root, fname)
+            try:
+                get_code(path)
+                count += 1
+            except (OSError, SyntaxError, ValueError) as e:
+                failed += 1
+                print(f"[bytecode_cache] Nepodarilo sa skompilovať {path}: {e}")
+    print(f"[bytecode_cache] Predkompilovaných súborov: {count}, chyby: {failed}")
+    return failed == 0
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Spustenie z príkazového riadku ----////
+if __name__ == "__main__":
+    ok = precompile_modules(sys.argv[1] if len(sys.argv) > 1 else "modules")
+    sys.exit(0 if ok else 1)
+# ////-----------------------------------------------------------------------------------------
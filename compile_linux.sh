@@ -24,6 +24,10 @@ if [ $? -eq 0 ]; then
   cp -r modules "$OUTPUT_DIR/$(basename ${ENTRYPOINT%.*})".dist/
 
   echo "Modules priečinok skopírovaný do $OUTPUT_DIR/$(basename ${ENTRYPOINT%.*}).dist/"
+
+  # Predkompilácia modulov (.pyc cache), aby štart nemusel kompilovať zdrojáky modulov
+  python3 bytecode_cache.py "$OUTPUT_DIR/$(basename ${ENTRYPOINT%.*})".dist/modules
+
   echo "Spustenie: $OUTPUT_DIR/$(basename ${ENTRYPOINT%.*}).dist/$(basename ${ENTRYPOINT%.*})"
 else
   echo "Kompilácia zlyhala"
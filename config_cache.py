@@ -0,0 +1,83 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Config Cache - JSON configy parsované najviac raz na zmenu súboru ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Kľúč je absolútna cesta, platnosť overuje (mtime_ns, veľkosť) z os.stat - jeden stat namiesto
+# open + json.load. save_json zapisuje atomicky (temp + os.replace) a rovno aktualizuje cache,
+# takže po vlastnom zápise sa súbor znova neparsuje.
+# Vrátené dáta sú zdieľané - kto ich chce meniť, nech si vyžiada copy=True.
+# Nesmie importovať Qt.
+
+import os
+import copy as _copy
+import json
+import threading
+
+# ////---- Stav cache ----////
+_cache = {}  # abspath -> ((mtime_ns, size), dáta)
+_lock = threading.Lock()
+_MISSING = object()
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Pomocné funkcie ----////
+def _signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Načítanie ----////
+def load_json(path, default=None, copy=False):
+    """Vráti obsah JSON súboru; pri chýbajúcom alebo neplatnom súbore default."""
+    key = os.path.abspath(path)
+    try:
+        signature = _signature(key)
+    except OSError:
+        with _lock:
+            _cache.pop(key, None)
+        return default
+
+    with _lock:
+        entry = _cache.get(key)
+    if entry is not None and entry[0] == signature:
+        data = entry[1]
+    else:
+        try:
+            with open(key, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[config_cache] Neplatný config {path}: {e}")
+            return default
+        with _lock:
+            _cache[key] = (signature, data)
+    return _copy.deepcopy(data) if copy else data
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Uloženie ----////
+def save_json(path, data, indent=2):
+    key = os.path.abspath(path)
+    tmp_path = f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(key), exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent, ensure_ascii=False)
+        os.replace(tmp_path, key)
+        signature = _signature(key)
+    except OSError as e:
+        print(f"[config_cache] Nepodarilo sa uložiť {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    with _lock:
+        _cache[key] = (signature, _copy.deepcopy(data))
+    return True
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Zneplatnenie (napr. hot reload modulu) ----////
+def invalidate(path=None):
+    with _lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(os.path.abspath(path), None)
+# ////-----------------------------------------------------------------------------------------
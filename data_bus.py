@@ -0,0 +1,195 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Data Bus - témy medzi logikou modulov a GUI ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Logika publikuje:   data_bus.publish("<modul>.<téma>", hodnota)   (z ľubovoľného vlákna)
+# GUI odoberá:        get_bridge().subscribe(téma, callback, mode="latest"|"queue")
+#
+# latest - callback dostane iba poslednú hodnotu (medzihodnoty sa zlúčia)
+# queue  - callback dostane list hodnôt od posledného doručenia, fronta má pevnú veľkosť
+#          a pri zaplnení zahadzuje najstaršie (backpressure - publikujúci nikdy nečaká)
+#
+# Doručuje drain(). QtBridge ho volá v GUI threade najviac raz za snímku displeja,
+# bez Qt (--nogui) ho môže volať ktokoľvek sám. V procese logiky (isolation "process")
+# sa publish cez forwarder posiela rúrou do hlavného procesu.
+# Nesmie importovať Qt.
+
+import threading
+import itertools
+import weakref
+from collections import deque
+
+# ////---- Konštanty ----////
+MODE_LATEST = "latest"
+MODE_QUEUE = "queue"
+MODES = (MODE_LATEST, MODE_QUEUE)
+DEFAULT_QUEUE_SIZE = 256
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Názov témy modulu ----////
+def topic(module_name, name):
+    return f"{module_name}.{name}"
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Odberateľ ----////
+class _Subscriber:
+    __slots__ = ("token", "topic", "ref", "mode", "value", "queue", "dirty", "dropped")
+
+    def __init__(self, token, topic, ref, mode, maxlen):
+        self.token = token
+        self.topic = topic
+        self.ref = ref
+        self.mode = mode
+        self.value = None
+        self.queue = deque(maxlen=maxlen) if mode == MODE_QUEUE else None
+        self.dirty = False
+        self.dropped = 0  # hodnoty zahodené plnou frontou
+
+# ////---- Handle odberu ----////
+class DataSubscription:
+    __slots__ = ("bus", "topic", "token")
+
+    def __init__(self, bus, topic, token):
+        self.bus = bus
+        self.topic = topic
+        self.token = token
+
+    def cancel(self):
+        self.bus.unsubscribe(self.topic, self.token)
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- DataBus ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class DataBus:
+    # ////---- Inicializácia ----////
+    def __init__(self):
+        self._topics = {}  # téma -> {token: _Subscriber}
+        self._latest = {}  # téma -> posledná publikovaná hodnota
+        self._dirty = deque()  # odberatelia s nedoručenými dátami
+        self._lock = threading.Lock()
+        self._tokens = itertools.count(1)
+        self._notifier = None  # zavolá sa raz, keď pribudnú dáta na doručenie
+        self._notify_pending = False
+        self._forwarder = None  # v procese logiky: publish -> rúra do hlavného procesu
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Napojenie na GUI / proces ----////
+    def set_notifier(self, notifier):
+        with self._lock:
+            self._notifier = notifier
+            notify = notifier is not None and bool(self._dirty)
+            self._notify_pending = notify
+        if notify:
+            notifier()  # dáta publikované ešte pred napojením GUI
+
+    def set_forwarder(self, forwarder):
+        self._forwarder = forwarder
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Publikovanie (ľubovoľné vlákno, nikdy neblokuje na odberateľa) ----////
+    def publish(self, topic, value):
+        if self._forwarder is not None:
+            self._forwarder(topic, value)
+            return
+        notify = False
+        with self._lock:
+            self._latest[topic] = value
+            for sub in self._topics.get(topic, {}).values():
+                if sub.mode == MODE_LATEST:
+                    sub.value = value
+                else:
+                    if len(sub.queue) == sub.queue.maxlen:
+                        sub.dropped += 1
+                    sub.queue.append(value)
+                if not sub.dirty:
+                    sub.dirty = True
+                    self._dirty.append(sub)
+            if self._dirty and self._notifier is not None and not self._notify_pending:
+                self._notify_pending = notify = True
+        if notify:
+            self._notifier()
+
+    def latest(self, topic, default=None):
+        return self._latest.get(topic, default)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Odber ----////
+    def subscribe(self, topic, callback, mode=MODE_LATEST, maxlen=None, replay_latest=True):
+        """Bound metóda sa drží slabo (WeakMethod). Vráti DataSubscription."""
+        if mode not in MODES:
+            raise ValueError(f"Neznámy režim odberu: {mode}")
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = lambda: callback
+        notify = False
+        with self._lock:
+            token = next(self._tokens)
+            sub = _Subscriber(token, topic, ref, mode, maxlen or DEFAULT_QUEUE_SIZE)
+            self._topics.setdefault(topic, {})[token] = sub
+            # Nový odberateľ dostane aktuálny stav témy pri najbližšom doručení
+            if replay_latest and topic in self._latest:
+                if mode == MODE_LATEST:
+                    sub.value = self._latest[topic]
+                else:
+                    sub.queue.append(self._latest[topic])
+                sub.dirty = True
+                self._dirty.append(sub)
+                if self._notifier is not None and not self._notify_pending:
+                    self._notify_pending = notify = True
+        if notify:
+            self._notifier()
+        return DataSubscription(self, topic, token)
+
+    def unsubscribe(self, topic, token):
+        with self._lock:
+            subs = self._topics.get(topic)
+            if subs and subs.pop(token, None) is not None and not subs:
+                del self._topics[topic]
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Doručenie (volá GUI thread alebo ktokoľvek bez Qt) ----////
+    def drain(self):
+        with self._lock:
+            batch, self._dirty = self._dirty, deque()
+            self._notify_pending = False
+            deliveries = []
+            for sub in batch:
+                sub.dirty = False
+                if sub.mode == MODE_LATEST:
+                    payload, sub.value = sub.value, None
+                else:
+                    payload = list(sub.queue)
+                    sub.queue.clear()
+                deliveries.append((sub, payload))
+
+        for sub, payload in deliveries:
+            callback = sub.ref()
+            if callback is None:
+                self.unsubscribe(sub.topic, sub.token)  # odberateľ medzitým zanikol
+                continue
+            try:
+                callback(payload)
+            except Exception as e:
+                print(f"[DataBus] Chyba v odberateľovi {sub.topic}: {e}")
+        return len(deliveries)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Diagnostika ----////
+    def stats(self):
+        with self._lock:
+            return {topic: {"subscribers": len(subs), "dropped": sum(s.dropped for s in subs.values())}
+                    for topic, subs in self._topics.items()}
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_bus_instance = DataBus()  # vytvorená pri importe - publish môže prísť z viacerých vlákien naraz
+
+def get_data_bus():
+    return _bus_instance
+
+def publish(topic, value):
+    _bus_instance.publish(topic, value)
+# ////-----------------------------------------------------------------------------------------
@@ -4,14 +4,25 @@
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QVBoxLayout, QHBoxLayout, QLabel,
-    QListWidget, QScrollArea, QDockWidget, QPushButton
+    QListWidget, QScrollArea, QDockWidget, QPushButton, QTabWidget,
+    QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog
 )
-from PySide6.QtCore import Qt, QUrl, QSize
+from PySide6.QtCore import Qt, QUrl, QSize, QTimer
 from PySide6.QtGui import QPixmap, QDesktopServices, QIcon
 import os, sys
-import importlib.util
+import bytecode_cache
 import overlay_manager
 import shortcut_manager
+import hot_reload
+import startup_profiler
+import module_stats
+import latency_stats
+import data_bus
+import config_cache
+import settings_store
+import widget_lifecycle
+from startup_profiler import span
+from module_registry import get_module_registry
 
 # Cesta k priečinku s modulmi
 module_path = "modules"
@@ -21,20 +32,13 @@ FALLBACK_IMAGE_PATH = os.path.join("assets", "pictures", "480x320.png")
 # ////-----------------------------------------------------------------------------------------
 
 def load_modules(module_path):
-    # Načíta názvy všetkých modulov
+    # Načíta názvy všetkých modulov zo zdieľaného registra (priečinok sa neskenuje znova)
     modules = {}
-    if not os.path.exists(module_path):
-        os.makedirs(module_path)
-
-    for module_name in os.listdir(module_path):
-        module_dir = os.path.join(module_path, module_name)
-        if os.path.isdir(module_dir):
-            # widgets ešte nenačítavame – iba si poznačíme prázdny zoznam
-            modules[module_name] = []
+    for module_name in get_module_registry(module_path).names():
+        # widgets ešte nenačítavame – iba si poznačíme prázdny zoznam
+        modules[module_name] = []
     return modules
 
-modules = load_modules(module_path)
-
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Základný widget pre moduly ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
@@ -54,6 +58,40 @@ class BaseWidget(QWidget):
         return os.path.join("modules", self.module_name, "data", filename)
     # ////-------------------------------------------------------------------------------------
 
+    # ////---- Nastavenia widgetu v settings store (bodové čítanie/zápis) ----////
+    def get_setting(self, key, default=None, item="widget"):
+        return settings_store.get_settings_store().get(self.module_name, item, key, default)
+
+    def set_setting(self, key, value, item="widget"):
+        settings_store.get_settings_store().set(self.module_name, item, key, value)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Config modulu: uložený v settings store, JSON v config/ je default ----////
+    def load_config(self, filename, default=None, copy=True):
+        # Najprv uložený config zo store, inak JSON z config/ cez zdieľanú cache
+        # (copy=True: widget môže vrátené dáta meniť bez vplyvu na cache)
+        values = settings_store.get_settings_store().get_item(self.module_name, settings_store.CONFIG_PREFIX + filename)
+        if values:
+            return values
+        return config_cache.load_json(self.get_config_path(filename), default, copy=copy)
+
+    def save_config(self, filename, data):
+        store = settings_store.get_settings_store()
+        item = settings_store.CONFIG_PREFIX + filename
+        if isinstance(data, dict):
+            store.replace_item(self.module_name, item, data)
+            return True
+        # Config, ktorý nie je objekt (list, ...), ostáva v JSON súbore - atomický zápis
+        store.delete_item(self.module_name, item)
+        return config_cache.save_json(self.get_config_path(filename), data)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Dáta z logiky modulu (namiesto čítania súborov z data/) ----////
+    def subscribe_data(self, name, callback, mode="latest", maxlen=None):
+        # Odber témy "<modul>.<name>", ktorú logika publikuje cez data_bus.publish
+        return shortcut_manager.get_bridge().subscribe(data_bus.topic(self.module_name, name), callback, mode, maxlen)
+    # ////-------------------------------------------------------------------------------------
+
     # ////---- Aktualizácia a zatvorenie widgetu ----////
     def update_widget(self):
         # Volané pri refreshi dát (napr. čítanie configu)
@@ -64,6 +102,153 @@ class BaseWidget(QWidget):
         pass
     # ////-------------------------------------------------------------------------------------
 
+    # ////---- Lifecycle: widget skrytý / znova zobrazený (prepnutie modulu) ----////
+    def on_suspend(self):
+        # Zastav prácu, ktorú nerobí LifecycleTimer (vlákna, sledovanie súborov...)
+        pass
+
+    def on_resume(self):
+        # Obnov stav po uspaní (napr. načítaj dáta zmenené medzitým)
+        pass
+
+    def is_suspended(self):
+        return widget_lifecycle.is_suspended(self)
+
+    def create_timer(self, interval, callback, single_shot=False):
+        # Timer sa pri uspaní widgetu sám zastaví a pri prebudení znova spustí
+        return widget_lifecycle.LifecycleTimer(self, interval, callback, single_shot)
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Panel so spotrebou CPU a pamäte po moduloch ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+
+class ModuleStatsPanel(QWidget):
+    COLUMNS = ("Modul", "Typ", "CPU s", "CPU %", "Alokácie KB", "Objekty")
+    REFRESH_MS = 3000  # gc.get_objects() nie je zadarmo, preto nie častejšie
+
+    def __init__(self):
+        super().__init__()
+        self.stats = module_stats.get_module_stats()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0,0,0,0)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSortingEnabled(True)
+        layout.addWidget(self.table)
+
+        export_button = QPushButton("Export JSON")
+        export_button.clicked.connect(self.export_json)
+        layout.addWidget(export_button)
+
+        # Timer beží iba keď je panel viditeľný
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        def fmt(value, pattern):
+            return "–" if value is None else pattern.format(value)
+
+        stats = self.stats.collect()
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(stats))
+        for row, (name, data) in enumerate(sorted(stats.items())):
+            alloc = data.get("alloc_bytes")
+            values = (
+                name,
+                data.get("kind") or "",
+                fmt(data.get("cpu_time"), "{:.2f}"),
+                fmt(data.get("cpu_percent"), "{:.1f}"),
+                fmt(None if alloc is None else alloc / 1024, "{:.0f}"),
+                fmt(data.get("objects"), "{}"),
+            )
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+        self.table.setSortingEnabled(True)
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export štatistík", "module_stats.json", "JSON (*.json)")
+        if path:
+            self.stats.dump_json(path)
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Panel latencie skratiek (hook -> emit -> GUI callback) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class LatencyPanel(QWidget):
+    COLUMNS = ("Event", "Fáza", "Počet", "p50 ms", "p99 ms", "max ms")
+    REFRESH_MS = 1000
+
+    def __init__(self):
+        super().__init__()
+        self.tracker = latency_stats.get_latency_tracker()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0,0,0,0)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons = QHBoxLayout()
+        export_button = QPushButton("Export JSON")
+        export_button.clicked.connect(self.export_json)
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        buttons.addWidget(export_button)
+        buttons.addWidget(reset_button)
+        layout.addLayout(buttons)
+
+        # Timer beží iba keď je panel viditeľný
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        def ms(value):
+            return "–" if value is None else f"{value / 1000:.2f}"
+
+        rows = [(event, stage, data) for event, stages in self.tracker.summary().items()
+                for stage, data in stages.items()]
+        self.table.setRowCount(len(rows))
+        for row, (event, stage, data) in enumerate(rows):
+            values = (event, stage, str(data["count"]), ms(data["p50_us"]), ms(data["p99_us"]), ms(data["max_us"]))
+            for col, value in enumerate(values):
+                self.table.setItem(row, col, QTableWidgetItem(value))
+
+    def reset(self):
+        self.tracker.reset()
+        self.refresh()
+
+    def export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export latencie", "shortcut_latency.json", "JSON (*.json)")
+        if path:
+            self.tracker.dump_json(path)
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Hlavné okno GUI aplikácie ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
@@ -96,18 +281,26 @@ class MainApp(QMainWindow):
         # Načítanie obrázka modulu
         img_path = os.path.join("assets", "pictures", "480x320.png")
         if os.path.exists(img_path):
-            pixmap = QPixmap(img_path)
-            self.image_label.setPixmap(pixmap.scaled(480, 320, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            with span("MainApp.pixmap", path=img_path):
+                pixmap = QPixmap(img_path)
+                self.image_label.setPixmap(pixmap.scaled(480, 320, Qt.KeepAspectRatio, Qt.SmoothTransformation))
 
         # Scroll zoznam modulov
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         self.list_widget = QListWidget()
-        self.list_widget.addItems(sorted(modules.keys()))
+        with span("MainApp.load_modules"):
+            self.list_widget.addItems(sorted(load_modules(module_path).keys()))  # sken až pri tvorbe okna, nie pri importe
         scroll_area.setWidget(self.list_widget)
-        scroll_area.setFixedWidth(480)
 
-        left_layout.addWidget(scroll_area)
+        # Záložky vedľa seba: zoznam modulov a živá tabuľka CPU/pamäte po moduloch
+        self.left_tabs = QTabWidget()
+        self.left_tabs.addTab(scroll_area, "Moduly")
+        self.left_tabs.addTab(ModuleStatsPanel(), "Zdroje")
+        self.left_tabs.addTab(LatencyPanel(), "Latencia")
+        self.left_tabs.setFixedWidth(480)
+
+        left_layout.addWidget(self.left_tabs)
         main_layout.addWidget(left_panel)
 
         # Jednoduché textové odkazy
@@ -122,7 +315,8 @@ class MainApp(QMainWindow):
         left_layout.addWidget(coffee_link)
 
         # Pravá dock oblasť pre widgety
-        self.right_dock = RightDockArea(image_label=self.image_label)
+        with span("RightDockArea.__init__"):
+            self.right_dock = RightDockArea(image_label=self.image_label)
         main_layout.addWidget(self.right_dock)
 
         # Pripojenie výberu modulu
@@ -137,18 +331,26 @@ class RightDockArea(QMainWindow):
     def __init__(self, image_label):
         super().__init__()
         self.module_widgets = {}
+        self.current_module = None
         self.setFixedWidth(1000)
         self.setContentsMargins(0,0,0,0)
         self.setDockNestingEnabled(True)
 
         self.image_label = image_label  # uložíme si QLabel z ľavej strany
 
+    @startup_profiler.profiled("RightDockArea.load_widgets")
     def load_widgets(self, module_name):
+        self.current_module = module_name
+        info = get_module_registry(module_path).get(module_name)
+        if info is None:
+            return
+
         # ---- Načítanie obrázka modulu ----
-        img_path = os.path.join(module_path, module_name, "assets", "pictures", "480x320.png")
-        if os.path.exists(img_path):
-            pixmap = QPixmap(img_path)
-            self.image_label.setPixmap(pixmap.scaled(480, 320, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+        img_path = info["image"]
+        if img_path:
+            with span("RightDockArea.pixmap", module=module_name):
+                pixmap = QPixmap(img_path)
+                self.image_label.setPixmap(pixmap.scaled(480, 320, Qt.KeepAspectRatio, Qt.SmoothTransformation))
         else:
             # fallback – šedé pozadie
             pixmap = QPixmap(480, 320)
@@ -160,8 +362,10 @@ class RightDockArea(QMainWindow):
             for dock in widgets:
                 if name == module_name:
                     dock.show()
+                    widget_lifecycle.resume(dock.widget())
                 else:
                     dock.hide()
+                    widget_lifecycle.suspend(dock.widget())
 
         # Ak už máme widgety načítané, nič nové netreba vytvárať
         if module_name in self.module_widgets:
@@ -171,6 +375,7 @@ class RightDockArea(QMainWindow):
         for dock in self.findChildren(QDockWidget):
             if not dock.objectName().startswith(f"{module_name}:"):
                 dock.hide()
+                widget_lifecycle.suspend(dock.widget())
 
         """# Odstráni existujúce dock widgety
         for dock in self.findChildren(QDockWidget):
@@ -183,8 +388,8 @@ class RightDockArea(QMainWindow):
             self.removeDockWidget(dock)
             dock.setParent(None)"""
 
-        module_dir = os.path.join(module_path, module_name, "widgets")
-        if not os.path.exists(module_dir):
+        module_dir = info["widgets_dir"]
+        if not info["widgets"]:
             return print(f"Modul {module_name} nemá žiadne widgety.")
 
          # Orientácia pre danú oblasť
@@ -196,26 +401,22 @@ class RightDockArea(QMainWindow):
 
         # Načíta všetky .py súbory v priečinku widgets
         grouped_by_area = {} # area -> list of (order, widget_name, widget)
-        for fname in os.listdir(module_dir):
-            if not fname.endswith(".py"):
-                continue
-
+        for fname in info["widgets"]:
             file_path = os.path.join(module_dir, fname)
             widget_name = os.path.splitext(fname)[0]
 
-            # Načítanie .py súboru ako modul
+            # Načítanie .py súboru ako modul (s .pyc cache)
             mod_key = f"{module_name}.{widget_name}"
-            spec = importlib.util.spec_from_file_location(mod_key, file_path)
-            mod = importlib.util.module_from_spec(spec)
-            sys.modules[mod_key] = mod
-            spec.loader.exec_module(mod)
+            with span("widget.exec_module", module=module_name, widget=widget_name):
+                mod = bytecode_cache.load_source_module(mod_key, file_path)
 
             # Vytvorenie widgetu
             widget = None
-            if hasattr(mod, "create_widget"):
-                widget = mod.create_widget(BaseWidget, module_name)
-            elif hasattr(mod, "Widget"):  # alternatíva: priamo trieda
-                widget = mod.Widget(module_name)
+            with span("widget.create_widget", module=module_name, widget=widget_name):
+                if hasattr(mod, "create_widget"):
+                    widget = mod.create_widget(BaseWidget, module_name)
+                elif hasattr(mod, "Widget"):  # alternatíva: priamo trieda
+                    widget = mod.Widget(module_name)
             if widget is None:
                 continue
 
@@ -263,38 +464,66 @@ class RightDockArea(QMainWindow):
                     if dock.objectName().startswith(f"{module_name}:")]
         self.module_widgets[module_name] = new_docks
 
+    def unload_widgets(self, module_name):
+        # Odstráni docky jedného modulu (hot reload), ostatné moduly ostávajú nedotknuté
+        for dock in self.module_widgets.pop(module_name, []):
+            widget = dock.widget()
+            try:
+                if hasattr(widget, "close_widget"):
+                    widget.close_widget()
+            except Exception as e:
+                print(f"[RightDockArea] Chyba pri zatváraní widgetu {dock.objectName()}: {e}")
+            self.removeDockWidget(dock)
+            dock.setParent(None)
+            dock.deleteLater()
+
 
 # ////-----------------------------------------------------------------------------------------
 
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Hlavná funkcia pre spustenie GUI aplikácie s callbackom na vypnutie main.py----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
-def main(on_close_callback=None):
-    app = QApplication(sys.argv)
+def main(on_close_callback=None, reload_logic_callback=None, watch_modules=None):
+    with span("QApplication"):
+        app = QApplication(sys.argv)
 
     # Vytvorenie hlavného okna aplikácie
-    window = MainApp()
+    with span("MainApp.__init__"):
+        window = MainApp()
 
     # Spustenie overlay managera
-    manager = overlay_manager.start_overlay_manager()
+    with span("start_overlay_manager"):
+        manager = overlay_manager.start_overlay_manager()
+
+    # Hot reload vybraných modulov (--watch-module=meno)
+    if watch_modules:
+        window.reloader = hot_reload.ModuleReloader(window.right_dock, manager, reload_logic_callback)
+        for name in watch_modules:
+            window.reloader.watch(name)
 
     # Spustenie shortcut listenera
-    shortcut_listener = shortcut_manager.get_shortcut_listener()
+    with span("get_shortcut_listener"):
+        shortcut_listener = shortcut_manager.get_shortcut_listener()
 
     def handle_close(event):
         overlay_manager.stop_overlay_manager() # Zastavenie overlay managera
         shortcut_manager.stop_shortcut_listener() # Zastavenie shortcut listenera
         print("[gui_main.py] Ukončenie GUI aplikácie callback o ukončení na main.py")
+        startup_profiler.write_trace()  # znova, aby obsahoval aj neskoršie load_widgets
         if on_close_callback:
             try:
                 on_close_callback()
             except Exception as e:
                 print(f"Chyba pri volaní on_close_callback: {e}")
-        os._exit(0)  # okamžité ukončenie procesu
+        os._exit(0)  # okamžité ukončenie procesu (logiky sú už zastavené s deadline v on_close_callback)
         event.accept()
     
     window.closeEvent = handle_close  # Priradenie vlastnej funkcie na zatvorenie okna
-    window.show()
+    with span("MainApp.show"):
+        window.show()
+    # Trace zapíšeme po prvej iterácii event loopu, keď je okno naozaj zobrazené
+    if startup_profiler.is_enabled():
+        QTimer.singleShot(0, startup_profiler.write_trace)
     sys.exit(app.exec())
 
 # ////---- Volanie hlavnej funkcie ----////
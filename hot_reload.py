@@ -0,0 +1,132 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Hot Reload - znovunačítanie jedného modulu bez reštartu loadera ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# QFileSystemWatcher (na Linuxe inotify) sleduje python/, widgets/ a overlays/ vybraného
+# modulu. Po zmene sa zastaví iba logika tohto modulu, odstránia sa jeho docky a overlay
+# okná a modul sa načíta znova. Ostatné moduly bežia ďalej.
+
+import os
+import time
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher
+
+import bytecode_cache
+from module_registry import get_module_registry
+
+# ////---- Konštanty ----////
+RELOAD_DEBOUNCE_MS = 300  # editory ukladajú na viac krokov (zápis + rename)
+WATCHED_DIRS = ("python", "widgets", "overlays")  # config/ a data/ nesledujeme, menia sa za behu
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ModuleReloader ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class ModuleReloader(QObject):
+    # ////---- Inicializácia ----////
+    def __init__(self, dock_area, overlay_manager, reload_logic_callback=None, modules_dir="modules"):
+        super().__init__()
+        self.dock_area = dock_area
+        self.overlay_manager = overlay_manager
+        self.reload_logic_callback = reload_logic_callback
+        self.registry = get_module_registry(modules_dir)
+        self._signatures = {}  # module_name -> {cesta: mtime} sledovaných .py súborov
+        self._pending = set()  # moduly čakajúce na reload (debounce)
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_path_changed)
+        self._watcher.directoryChanged.connect(self._on_path_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(RELOAD_DEBOUNCE_MS)
+        self._timer.timeout.connect(self._reload_pending)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Sledovanie modulu ----////
+    def watch(self, module_name):
+        info = self.registry.get(module_name)
+        if info is None:
+            print(f"[HotReload] Modul {module_name} neexistuje, nesledujem ho")
+            return
+        self._signatures[module_name] = self._signature(info["path"])
+        self._add_paths(info["path"])
+        print(f"[HotReload] Sledujem modul {module_name}")
+
+    def _watched_files(self, module_dir):
+        for sub in WATCHED_DIRS:
+            sub_dir = os.path.join(module_dir, sub)
+            try:
+                names = os.listdir(sub_dir)
+            except OSError:
+                continue
+            yield sub_dir
+            for fname in names:
+                if fname.endswith(".py"):
+                    yield os.path.join(sub_dir, fname)
+
+    def _add_paths(self, module_dir):
+        # Editory často súbor nahradia (rename), watcher ho potom stratí - pridávame znova
+        paths = [module_dir] + list(self._watched_files(module_dir))
+        missing = [p for p in paths if p not in self._watcher.files() and p not in self._watcher.directories()]
+        if missing:
+            self._watcher.addPaths(missing)
+
+    def _signature(self, module_dir):
+        signature = {}
+        for path in self._watched_files(module_dir):
+            if path.endswith(".py"):
+                try:
+                    signature[path] = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+        return signature
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zmena na disku -> naplánovanie reloadu ----////
+    def _on_path_changed(self, path):
+        norm = os.path.normpath(path)
+        for module_name in self._signatures:
+            module_dir = os.path.normpath(os.path.join(self.registry.modules_dir, module_name))
+            if norm == module_dir or norm.startswith(module_dir + os.sep):
+                self._pending.add(module_name)
+        if self._pending:
+            self._timer.start()  # reštart timera = debounce
+
+    def _reload_pending(self):
+        pending, self._pending = self._pending, set()
+        for module_name in pending:
+            module_dir = os.path.join(self.registry.modules_dir, module_name)
+            signature = self._signature(module_dir)
+            self._add_paths(module_dir)
+            # Zmena v __pycache__ a pod. nemení .py súbory - reload nie je potrebný
+            if signature == self._signatures.get(module_name):
+                continue
+            self._signatures[module_name] = signature
+            self.reload_module(module_name)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Samotný reload jedného modulu ----////
+    def reload_module(self, module_name):
+        start = time.perf_counter()
+        print(f"[HotReload] Znovunačítavam modul {module_name}…")
+
+        # 1) Odstránenie starých widgetov, overlayov a kódu
+        self.dock_area.unload_widgets(module_name)
+        self.overlay_manager.unload_module_overlays(module_name)
+        bytecode_cache.unload_modules(module_name)
+
+        # 2) Nový záznam v registri (zmenený zoznam widgetov/overlayov)
+        info = self.registry.rescan_module(module_name)
+
+        # 3) Reštart logiky (na pozadí, GUI nečaká), overlayov a (ak je modul zobrazený) widgetov
+        if self.reload_logic_callback:
+            try:
+                self.reload_logic_callback(module_name)
+            except Exception as e:
+                print(f"[HotReload] Chyba pri reštarte logiky {module_name}: {e}")
+        if info:
+            self.overlay_manager.load_module_overlays(module_name, info)
+            if self.dock_area.current_module == module_name:
+                self.dock_area.load_widgets(module_name)
+
+        print(f"[HotReload] Modul {module_name} znovu načítaný za {(time.perf_counter() - start) * 1000:.0f} ms")
+    # ////-------------------------------------------------------------------------------------
@@ -0,0 +1,168 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Latency Stats - latencia skratiek po fázach (HDR histogram) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Každá skratka sa označí časom v pynput callbacku (hook), v QtBridge.emit, pri štarte
+# callbacku v GUI threade a po jeho skončení. Rozdiely sa zapisujú do histogramov
+# s log-lineárnymi košmi (ako HdrHistogram): zápis je O(1), relatívna chyba ~3 %.
+# Nesmie importovať Qt - dump funguje aj z main.py.
+
+import os
+import json
+import time
+import threading
+
+# ////---- Fázy ----////
+STAGE_HOOK_TO_EMIT = "hook→emit"        # ring buffer + consumer thread + trie
+STAGE_EMIT_TO_START = "emit→start"      # čakanie vo fronte GUI threadu
+STAGE_CALLBACK = "callback"             # samotný callback (napr. toggle_global_show)
+STAGE_TOTAL = "total"                   # hook → koniec callbacku
+STAGES = (STAGE_HOOK_TO_EMIT, STAGE_EMIT_TO_START, STAGE_CALLBACK, STAGE_TOTAL)
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- LatencyHistogram ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Hodnoty v mikrosekundách. 0-63 us presne, potom každá mocnina dvoch rozdelená na 32 košov.
+class LatencyHistogram:
+    SUB_BITS = 5
+    SUB_COUNT = 1 << SUB_BITS
+
+    # ////---- Inicializácia ----////
+    def __init__(self):
+        self.counts = []
+        self.total = 0
+        self.max = 0
+        self.sum = 0
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Index koša a jeho horná hranica ----////
+    @classmethod
+    def _index(cls, value):
+        if value < 2 * cls.SUB_COUNT:
+            return value
+        shift = value.bit_length() - (cls.SUB_BITS + 1)
+        return (shift + 1) * cls.SUB_COUNT + (value >> shift) - cls.SUB_COUNT
+
+    @classmethod
+    def _upper(cls, index):
+        if index < 2 * cls.SUB_COUNT:
+            return index
+        shift = index // cls.SUB_COUNT - 1
+        mantissa = index % cls.SUB_COUNT + cls.SUB_COUNT
+        return ((mantissa + 1) << shift) - 1
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zápis a čítanie ----////
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        index = self._index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent):
+        """Hodnota v mikrosekundách, pod ktorou je percent % záznamov."""
+        if not self.total:
+            return None
+        target = max(1, int(round(self.total * percent / 100.0)))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.total,
+            "p50_us": self.percentile(50),
+            "p99_us": self.percentile(99),
+            "max_us": self.max if self.total else None,
+            "mean_us": self.sum / self.total if self.total else None,
+        }
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- LatencyTracker - histogramy podľa (event, fáza) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class LatencyTracker:
+    # ////---- Inicializácia ----////
+    def __init__(self):
+        self._histograms = {}  # (event, fáza) -> LatencyHistogram
+        self._lock = threading.Lock()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zápis ----////
+    def record(self, event, stage, seconds):
+        with self._lock:
+            histogram = self._histograms.get((event, stage))
+            if histogram is None:
+                histogram = self._histograms[(event, stage)] = LatencyHistogram()
+            histogram.record(seconds)
+
+    def record_dispatch(self, event, t_hook, t_emit, t_start, t_end):
+        """Zapíše všetky fázy jedného doručenia (t_hook môže chýbať pri emit mimo hooku)."""
+        self.record(event, STAGE_EMIT_TO_START, t_start - t_emit)
+        self.record(event, STAGE_CALLBACK, t_end - t_start)
+        if t_hook is not None:
+            self.record(event, STAGE_TOTAL, t_end - t_hook)
+
+    def merged(self, stage):
+        """Jeden histogram fázy cez všetky eventy"""
+        result = LatencyHistogram()
+        with self._lock:
+            for (_, hist_stage), histogram in self._histograms.items():
+                if hist_stage == stage:
+                    result.merge(histogram)
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Výstup ----////
+    def summary(self):
+        """{event: {fáza: {count, p50_us, p99_us, max_us, mean_us}}}"""
+        with self._lock:
+            items = [(key, hist.summary()) for key, hist in self._histograms.items()]
+        result = {}
+        for (event, stage), data in sorted(items, key=lambda item: (item[0][0], STAGES.index(item[0][1]))):
+            result.setdefault(event, {})[stage] = data
+        return result
+
+    def dump_json(self, path):
+        data = {"timestamp": time.time(), "pid": os.getpid(), "events": self.summary()}
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"[latency_stats] Latencie uložené do {path}")
+        except OSError as e:
+            print(f"[latency_stats] Latencie sa nepodarilo uložiť: {e}")
+        return data
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_tracker_instance = None
+
+def get_latency_tracker():
+    global _tracker_instance
+    if _tracker_instance is None:
+        _tracker_instance = LatencyTracker()
+    return _tracker_instance
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,208 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Logic Scheduler - tick API pre logiku modulov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Namiesto vlastného vlákna so slučkou "while not stop_event.is_set(): ...; time.sleep(x)"
+# môže modul definovať:
+#
+#     LOGIC_TICK_INTERVAL = 0.5          # sekundy medzi tickmi (predvolene 1.0)
+#     def logic_tick(ctx): ...           # jeden krok logiky, vráti False ak chce skončiť
+#
+# Jeden plánovač s obmedzeným poolom workerov spúšťa ticky všetkých modulov. Ticky, ktoré
+# sú splatné v rámci TICK_COALESCE_WINDOW, sa spustia v jednom prebudení.
+
+import time
+import heapq
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+# ////---- Konštanty ----////
+DEFAULT_TICK_INTERVAL = 1.0   # sekundy
+DEFAULT_WORKERS = 4           # max. počet súčasne bežiacich tickov
+TICK_COALESCE_WINDOW = 0.005  # ticky splatné do 5 ms sa spustia spolu
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- TickContext - objekt odovzdaný do logic_tick(ctx) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class TickContext:
+    def __init__(self, module_name, stop_event, interval):
+        self.module_name = module_name
+        self.stop_event = stop_event
+        self.interval = interval  # modul ho môže za behu zmeniť
+        self.state = {}           # perzistentný stav medzi tickmi
+        self.tick_count = 0
+        self.last_tick = None     # time.monotonic() posledného ticku
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- TickJob - handle s rovnakým rozhraním ako threading.Thread ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class TickJob:
+    def __init__(self, scheduler, module_name, logic, stop_event):
+        self.name = module_name
+        self.logic = logic
+        self.stop_event = stop_event
+        interval = getattr(logic, "LOGIC_TICK_INTERVAL", DEFAULT_TICK_INTERVAL)
+        self.ctx = TickContext(module_name, stop_event, interval)
+        self._scheduler = scheduler
+        self._idle = threading.Event()  # nastavený, keď práve nebeží žiadny tick
+        self._idle.set()
+        self._done = threading.Event()  # nastavený, keď job definitívne skončil
+        self._cancelled = False  # cancel(): už sa nenaplánuje ďalší tick
+        self.cpu_time = 0.0  # súčet CPU času všetkých tickov (module_stats)
+
+    # ////---- Rozhranie ako threading.Thread ----////
+    def start(self):
+        self._scheduler.schedule(self, time.monotonic())
+
+    def is_alive(self):
+        if self._done.is_set():
+            return False
+        # Po stop_event už job nežije, len čo dobehne prípadný rozbehnutý tick
+        return not (self.stop_event.is_set() and self._idle.is_set())
+
+    def join(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.is_alive():
+            remaining = 0.1 if deadline is None else min(0.1, deadline - time.monotonic())
+            if remaining <= 0:
+                return
+            if self.stop_event.is_set():
+                self._idle.wait(remaining)
+            else:
+                self._done.wait(remaining)
+
+    def cancel(self):
+        # Bežiaci tick sa prerušiť nedá, ale ďalší sa už nespustí
+        self._cancelled = True
+        self._scheduler.unschedule(self)
+        if self._idle.is_set():
+            self._done.set()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Jeden tick (beží vo workeri) ----////
+    def run_tick(self):
+        cpu_start = time.thread_time()
+        try:
+            if self.stop_event.is_set():
+                self._done.set()
+                return None
+            self.ctx.last_tick = time.monotonic()
+            self.ctx.tick_count += 1
+            if self.logic.logic_tick(self.ctx) is False:
+                self._done.set()
+                return None
+            return max(0.0, float(self.ctx.interval))
+        except Exception as e:
+            print(f"Chyba v logic_tick modulu {self.name}: {e}")
+            traceback.print_exc()
+            self._done.set()
+            return None
+        finally:
+            self.cpu_time += time.thread_time() - cpu_start
+            self._idle.set()
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- LogicScheduler ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class LogicScheduler:
+    # ////---- Inicializácia ----////
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self._heap = []  # (due, seq, job)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="logic-tick")
+        self._thread = threading.Thread(target=self._dispatch_loop, name="logic-scheduler", daemon=True)
+        self._thread.start()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Registrácia modulu ----////
+    def create_job(self, module_name, logic, stop_event):
+        return TickJob(self, module_name, logic, stop_event)
+
+    def schedule(self, job, due):
+        with self._cond:
+            if self._stopped or job._cancelled:
+                return
+            self._seq += 1
+            heapq.heappush(self._heap, (due, self._seq, job))
+            self._cond.notify()
+
+    def unschedule(self, job):
+        with self._cond:
+            heap = [entry for entry in self._heap if entry[2] is not job]
+            if len(heap) != len(self._heap):
+                heapq.heapify(heap)
+                self._heap = heap
+                self._cond.notify()  # dispečer mohol čakať práve na tento job
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Dispečer - jedno vlákno pre všetky moduly ----////
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    timeout = self._heap[0][0] - time.monotonic() if self._heap else None
+                    self._cond.wait(timeout)
+                if self._stopped:
+                    return
+                # Zlúčenie prebudení: zoberieme všetko, čo je splatné v okne TICK_COALESCE_WINDOW
+                limit = time.monotonic() + TICK_COALESCE_WINDOW
+                due_jobs = []
+                while self._heap and self._heap[0][0] <= limit:
+                    due, _, job = heapq.heappop(self._heap)
+                    due_jobs.append((due, job))
+
+            for due, job in due_jobs:
+                if job.stop_event.is_set():
+                    job._done.set()
+                    continue
+                job._idle.clear()
+                try:
+                    self._executor.submit(self._run_job, job, due)
+                except RuntimeError:
+                    job._idle.set()  # executor už je vypnutý
+
+    def _run_job(self, job, due):
+        interval = job.run_tick()
+        if interval is None:
+            return
+        # Ďalší tick počítame od plánovaného času (bez driftu), moduly s rovnakým
+        # intervalom tak zostanú zarovnané a zobudia sa spolu.
+        next_due = due + interval
+        now = time.monotonic()
+        if next_due < now:
+            next_due = now
+        self.schedule(job, next_due)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zastavenie ----////
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._heap.clear()
+            self._cond.notify_all()
+        # Čakajúce ticky nerušíme - run_tick() pri nastavenom stop_event len uvoľní job
+        self._executor.shutdown(wait=False)
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_scheduler_instance = None
+
+def get_logic_scheduler():
+    global _scheduler_instance
+    if _scheduler_instance is None:
+        _scheduler_instance = LogicScheduler()
+    return _scheduler_instance
+
+def stop_logic_scheduler():
+    global _scheduler_instance
+    if _scheduler_instance:
+        _scheduler_instance.stop()
+        _scheduler_instance = None
+# ////-----------------------------------------------------------------------------------------
@@ -5,18 +5,37 @@
 # ////---- Importovanie potrebných knižníc pre moduly ----////
 import os
 import sys
-import importlib.util
+import ast
 import threading
 import subprocess
 import platform
 import atexit
-import gui_main
+import multiprocessing
+# gui_main (PySide6, pynput, overlay manager) sa importuje až pri štarte GUI, --nogui ho nenačíta
 
-from glob import glob
+import process_runner
+import bytecode_cache
+import logic_scheduler
+import async_runtime
+import shutdown_coordinator
+import startup_profiler
+import module_stats
+import latency_stats
+import shm_channel
+import settings_store
+from module_registry import get_module_registry
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Načítanie cesty k modulu ----////
 MODULES_DIR = "modules"
+LOGIC_API_TICK = "tick"      # logic_tick(ctx) v spoločnom plánovači
+LOGIC_API_ASYNC = "async"    # async def logic_main_init / main na zdieľanom loope
+LOGIC_API_THREAD = "thread"  # legacy logic_main_init / main vo vlastnom vlákne
+LOGIC_APIS = (LOGIC_API_TICK, LOGIC_API_ASYNC, LOGIC_API_THREAD)
+_logics_stopped = False  # stop_all_logics sa volá z close callbacku aj z atexit
+_shutdown_timeout = shutdown_coordinator.SHUTDOWN_DEADLINE  # --shutdown-timeout, overený v main()
+_restart_lock = threading.Lock()  # chráni zoznamy logík a _restarting pri reštarte na pozadí
+_restarting = {}  # modul -> True ak počas reštartu prišla ďalšia požiadavka
 
 # Zaručíme, že cesta k modulu je v sys.path, aby sme mohli importovať moduly po skompilovaní
 module_path = os.path.join(os.path.dirname(__file__), "modules")
@@ -28,30 +47,88 @@ if module_path not in sys.path:
 # ////---- Funkcie na načítanie a spustenie logiky modulov ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
 
-# ////---- Nájdenie logiky v python zložke ----////
-def find_logic_py(module_path):
-    logic_path = os.path.join(module_path, "python", "logic.py")
-    return logic_path if os.path.isfile(logic_path) else None
+# ////---- Načítanie parametra z príkazového riadku (--meno=hodnota) ----////
+def get_cli_option(name, default=None):
+    prefix = f"--{name}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+    return default
 # ////-----------------------------------------------------------------------------------------
 
-# ////---- Spustenie Python logiky ----////
-def run_python_logic(logic_path, stop_event):
+# ////---- Deadline ukončenia z parametra --shutdown-timeout=sekundy ----////
+def get_shutdown_timeout():
+    value = get_cli_option("shutdown-timeout")
+    if value is None:
+        return shutdown_coordinator.SHUTDOWN_DEADLINE
     try:
-        # Dynamické načítanie modulu z daného súboru
-        spec = importlib.util.spec_from_file_location("logic", logic_path)
-        logic = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(logic)
+        timeout = float(value)
+    except ValueError:
+        timeout = -1.0
+    if not timeout >= 0:  # zachytí aj nan
+        print(f"[main.py] Neplatný --shutdown-timeout '{value}', používam {shutdown_coordinator.SHUTDOWN_DEADLINE} s")
+        return shutdown_coordinator.SHUTDOWN_DEADLINE
+    return timeout
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Načítanie Python logiky ----////
+def load_logic_module(module_name, logic_path):
+    # Dynamické načítanie modulu z daného súboru (s .pyc cache a unikátnym menom modulu -
+    # spoločné "logic" v sys.modules by si moduly navzájom prepisovali)
+    return bytecode_cache.load_source_module(f"{module_name}.python.logic", logic_path)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Zistenie API logiky bez jej spustenia ----////
+def detect_logic_api(logic_path, manifest):
+    # Manifest ("logic_api": "tick"|"async"|"thread") má prednosť, inak sa pozrieme do zdrojáku
+    # cez ast - top-level kód modulu sa na hlavnom vlákne nevykoná
+    api = manifest.get("logic_api")
+    if api in LOGIC_APIS:
+        return api
+    if api is not None:
+        print(f"[main.py] Neznáme logic_api '{api}' v manifeste, zisťujem zo zdrojáku")
+    try:
+        with open(logic_path, "rb") as f:
+            tree = ast.parse(f.read(), filename=logic_path)
+    except (OSError, SyntaxError, ValueError) as e:
+        print(f"[main.py] Nepodarilo sa analyzovať {logic_path}: {e}")
+        return LOGIC_API_THREAD  # chybu pri importe nahlási samotné vlákno logiky
+    functions = {node.name: node for node in tree.body
+                 if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))}
+    if "logic_tick" in functions:
+        return LOGIC_API_TICK
+    # Rovnaké poradie ako pri spustení: logic_main_init má prednosť pred main
+    entry = functions.get("logic_main_init") or functions.get("main")
+    if isinstance(entry, ast.AsyncFunctionDef):
+        return LOGIC_API_ASYNC
+    return LOGIC_API_THREAD
+# ////-----------------------------------------------------------------------------------------
 
+# ////---- Spustenie načítanej Python logiky ----////
+def run_logic_module(logic, logic_path, stop_event):
+    try:
         # Spustenie logiky
         if hasattr(logic, "logic_main_init"):
             logic.logic_main_init(stop_event=stop_event)
         elif hasattr(logic, "main"):
             logic.main()
+        elif hasattr(logic, "logic_tick"):
+            print(f"[main.py] {logic_path}: logic_tick nebol nájdený v zdrojáku, nastav \"logic_api\": \"tick\" v manifeste")
     except Exception as e:
         print(f"Chyba pri spustení logiky {logic_path}: {e}")
     # else: nothing to run
 # ////-----------------------------------------------------------------------------------------
 
+# ////---- Spustenie Python logiky (import aj beh vo vlákne logiky) ----////
+def run_python_logic(module_name, logic_path, stop_event):
+    try:
+        logic = load_logic_module(module_name, logic_path)
+    except Exception as e:
+        print(f"Chyba pri spustení logiky {logic_path}: {e}")
+        return
+    run_logic_module(logic, logic_path, stop_event)
+# ////-----------------------------------------------------------------------------------------
+
 # ////---- Spustenie binárneho súboru ----////
 # Poznámka: Toto je pozastavené, pretože open-source moduly by mali používať Python logiku
 """def run_binary(module_path):
@@ -67,64 +144,245 @@ def run_python_logic(logic_path, stop_event):
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Funkcia pre ukončenie všetkých logík ----////
-def stop_all_logics(stop_events, logic_threads, exit_app=False):
-    for stop_event in stop_events:
-        stop_event.set()  # Nastavenie stop_event, čo ukončí bežiacu logiku
-    # for thread in logic_threads:
-    #    thread.join()  # Čakáme na ukončenie vlákien EDIT nečakáme trvá to dlho!
-    print("[main.py] Všetky logiky boli ukončené.")
+def stop_all_logics(stop_events, logic_threads, exit_app=False, deadline=None):
+    global _logics_stopped
+    if not _logics_stopped:
+        _logics_stopped = True
+        if deadline is None:
+            deadline = _shutdown_timeout
+
+        # --stats-dump=cesta.json - posledný stav CPU/pamäte po moduloch pred ich zastavením
+        stats_path = get_cli_option("stats-dump")
+        if stats_path:
+            module_stats.get_module_stats().dump_json(stats_path)
+        # --latency-dump=cesta.json - histogramy latencie skratiek (hook -> GUI callback)
+        latency_path = get_cli_option("latency-dump")
+        if latency_path:
+            latency_stats.get_latency_tracker().dump_json(latency_path)
+
+        # Signál všetkým modulom, paralelné čakanie pod jedným deadline, opustenie oneskorencov
+        # a výpis času ukončenia každého modulu (moduly tak stihnú uložiť svoje dáta)
+        shutdown_coordinator.shutdown_logics(stop_events, logic_threads, deadline=deadline)
+        logic_scheduler.stop_logic_scheduler()
+        async_runtime.stop_async_runtime(grace=0.2)  # na úlohy sa už čakalo v rámci deadline
+        shm_channel.release_all_channels()  # logiky už nezapisujú - segmenty sa môžu zrušiť
+        settings_store.close_settings_store()  # checkpoint WAL do hlavného súboru databázy
+        print("[main.py] Všetky logiky boli ukončené.")
     if exit_app:
         from PySide6.QtWidgets import QApplication
         QApplication.quit()  # korektne ukončí Qt event loop
         # sys.exit(0)  # Ukončíme aplikáciu
 # ////-----------------------------------------------------------------------------------------
 
+# ////---- Čakanie na logiky v režime bez GUI ----////
+def wait_for_logics(stop_events, logic_threads):
+    # Procesy (na rozdiel od vlákien) nedržia hlavný proces nažive, preto čakáme explicitne
+    try:
+        for handle in logic_threads:
+            while handle.is_alive():
+                handle.join(timeout=0.5)  # timeout kvôli Ctrl+C na Windows
+    except KeyboardInterrupt:
+        stop_all_logics(stop_events, logic_threads, exit_app=False)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Režim izolácie z parametra --isolation=thread|process ----////
+def get_isolation_mode(isolation=None):
+    if isolation is None:
+        isolation = get_cli_option("isolation", process_runner.ISOLATION_THREAD)
+    if isolation not in process_runner.ISOLATION_MODES:
+        print(f"[main.py] Neznámy režim izolácie '{isolation}', používam 'thread'")
+        isolation = process_runner.ISOLATION_THREAD
+    return isolation
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Spustenie logiky jedného modulu ----////
+def start_module_logic(module_name, info, isolation=process_runner.ISOLATION_THREAD):
+    """Spustí logiku modulu a vráti (stop_event, handle), alebo None ak modul logiku nemá."""
+    logic_py = info["logic"]
+    # Ak neexistuje python logika, skúšame spustiť binárku (pozastavené pre open-source pristup)
+    if not logic_py:
+        #print(f"Python logika nenájdená v {info['path']}, skúšam binárku...")
+        #run_binary(info["path"])
+        return None
+
+    print(f"Načítavam Python logiku: {logic_py}")
+
+    # Kanály zdieľanej pamäte z manifestu musia existovať skôr, než ich logika otvorí
+    shm_channel.provide_module_channels(module_name, info["manifest"].get("channels"))
+
+    # Manifest modulu má prednosť pred parametrom --isolation
+    module_isolation = info["manifest"].get("isolation", isolation)
+    logic_api = detect_logic_api(logic_py, info["manifest"])
+    if module_isolation == process_runner.ISOLATION_PROCESS and logic_api == LOGIC_API_TICK:
+        # Worker proces nemá plánovač tickov - logic_tick by sa v ňom nikdy nezavolal
+        print(f"[main.py] Modul {module_name} používa logic_tick, izolácia 'process' nie je podporovaná - beží v plánovači")
+        module_isolation = process_runner.ISOLATION_THREAD
+    if module_isolation == process_runner.ISOLATION_PROCESS:
+        # Spustenie logiky v samostatnom procese (medziprocesový stop_event)
+        stop_event = process_runner.create_stop_event()
+        logic_thread = process_runner.LogicProcess(module_name, logic_py, stop_event)
+    else:
+        logic = None
+        if logic_api != LOGIC_API_THREAD:
+            # Tick a async moduly sa importujú tu - ich top-level kód má byť rýchly
+            try:
+                logic = load_logic_module(module_name, logic_py)
+            except Exception as e:
+                print(f"Chyba pri spustení logiky {logic_py}: {e}")
+                return None
+            if logic_api == LOGIC_API_ASYNC and not async_runtime.is_async_logic(logic):
+                logic_api = LOGIC_API_THREAD  # napr. manifest hlási async, ale funkcia nie je coroutine
+
+        if logic_api == LOGIC_API_TICK:
+            # Tick API - beží v spoločnom plánovači, nie vo vlastnom vlákne
+            stop_event = threading.Event()
+            logic_thread = logic_scheduler.get_logic_scheduler().create_job(module_name, logic, stop_event)
+        elif logic_api == LOGIC_API_ASYNC:
+            # async def logic_main_init / main - úloha na zdieľanom asyncio loope
+            runtime = async_runtime.get_async_runtime()
+            stop_event = runtime.create_stop_event()
+            logic_thread = runtime.create_job(module_name, logic, stop_event)
+        else:
+            stop_event = threading.Event()
+            # Spustenie logiky v samostatnom vlákne (legacy logic_main_init / main) - aj import
+            # prebehne vo vlákne, pomalý top-level kód modulu tak nebrzdí štart ostatných
+            # daemon=True: modul, ktorý nestihne shutdown deadline, nesmie blokovať ukončenie
+            if logic is None:
+                logic_thread = threading.Thread(target=run_python_logic, args=(module_name, logic_py, stop_event), name=module_name, daemon=True)
+            else:
+                logic_thread = threading.Thread(target=run_logic_module, args=(logic, logic_py, stop_event), name=module_name, daemon=True)
+
+    logic_thread.start()
+    return stop_event, logic_thread
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Reštart logiky jedného modulu (hot reload) ----////
+def restart_module_logic(module_name, stop_events, logic_threads, isolation=None):
+    # Volá sa z GUI threadu - čakanie na starú logiku (až do deadline) beží na pozadí,
+    # aby nezamrzol Qt event loop. Požiadavky počas bežiaceho reštartu sa zlúčia do jednej.
+    with _restart_lock:
+        if module_name in _restarting:
+            _restarting[module_name] = True
+            return
+        _restarting[module_name] = False
+    threading.Thread(target=_restart_worker, args=(module_name, stop_events, logic_threads, isolation),
+                     name=f"restart:{module_name}", daemon=True).start()
+
+def _restart_worker(module_name, stop_events, logic_threads, isolation):
+    while True:
+        try:
+            _restart_module_logic(module_name, stop_events, logic_threads, isolation)
+        except Exception as e:
+            print(f"[main.py] Chyba pri reštarte logiky {module_name}: {e}")
+        with _restart_lock:
+            if not _restarting.get(module_name) or _logics_stopped:
+                _restarting.pop(module_name, None)
+                return
+            _restarting[module_name] = False  # medzitým prišla ďalšia zmena - ešte jeden reštart
+
+def _restart_module_logic(module_name, stop_events, logic_threads, isolation):
+    # Zastavenie starej logiky - rovnaký deadline mechanizmus ako pri ukončení aplikácie
+    with _restart_lock:
+        old = [(e, t) for e, t in zip(stop_events, logic_threads) if t.name == module_name]
+    if old:
+        shutdown_coordinator.shutdown_logics([e for e, _ in old], [t for _, t in old],
+                                             deadline=_shutdown_timeout)
+        for _, handle in old:
+            if handle.is_alive():
+                handle.join(timeout=0.5)  # terminate()/cancel() sa prejaví s malým oneskorením
+        alive = [handle for _, handle in old if handle.is_alive()]
+        if alive:
+            # Vlákno sa zabiť nedá - druhá inštancia logiky by bežala súbežne so starou
+            print(f"[main.py] Stará logika {module_name} stále beží, reštart preskočený")
+            return
+        with _restart_lock:
+            for stop_event, handle in old:
+                stop_events.remove(stop_event)
+                logic_threads.remove(handle)
+
+    if _logics_stopped:
+        return  # aplikácia sa medzitým ukončuje
+
+    # Spustenie novej logiky podľa aktuálneho záznamu v registri
+    info = get_module_registry(MODULES_DIR).get(module_name)
+    if info:
+        started = start_module_logic(module_name, info, get_isolation_mode(isolation))
+        if started:
+            with _restart_lock:
+                stop_events.append(started[0])
+                logic_threads.append(started[1])
+            if _logics_stopped:
+                started[0].set()  # ukončenie začalo počas štartu novej logiky
+# ////-----------------------------------------------------------------------------------------
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Hlavná funkcia pre spustenie GUI a logiky modulov ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
-def main():
-    # Získanie všetkých ciest k modulom v adresári modules
-    module_paths = [os.path.dirname(p) for p in glob(os.path.join(MODULES_DIR, "*", "python", "logic.py"))]
-    all_modules = [os.path.join(MODULES_DIR, d) for d in os.listdir(MODULES_DIR) if os.path.isdir(os.path.join(MODULES_DIR, d))]
+@startup_profiler.profiled("main.main")
+def main(isolation=None):
+    global _shutdown_timeout
+    # Parameter sa overí hneď pri štarte, nie až v atexit pri ukončení
+    _shutdown_timeout = get_shutdown_timeout()
+
+    # Získanie všetkých modulov zo zdieľaného registra (jeden sken, cache na disku)
+    registry = get_module_registry(MODULES_DIR)
+    with startup_profiler.span("registry.scan"):
+        registry.scan()
+
+    # Režim izolácie: --isolation=thread|process, manifest modulu má prednosť
+    isolation = get_isolation_mode(isolation)
 
     stop_events = []  # Uchová stop_events pre každý modul
     logic_threads = []  # Uchová referencie na vlákna
 
     # Zaregistrujeme ukončenie všetkých logík pri ukončení programu
     atexit.register(lambda: stop_all_logics(stop_events, logic_threads, exit_app=False))
+
+    # Štatistiky CPU/pamäte čítajú ten istý zoznam handle (aj po hot reloade)
+    module_stats.get_module_stats().track(logic_threads)
     
     # Spúšťanie nezávyslej logiky pre každý modul
-    for module_path in all_modules:
-        logic_py = find_logic_py(module_path)
-        # Ak existuje python logika v module, spustíme ju
-        if logic_py:
-            print(f"Načítavam Python logiku: {logic_py}")
-
-            # Vytvorenie stop_event pre tento modul
-            stop_event = threading.Event()
+    for module_name, info in registry.modules().items():
+        with startup_profiler.span("logic.start", module=module_name):
+            started = start_module_logic(module_name, info, isolation)
+        if started:
+            stop_event, logic_thread = started
             stop_events.append(stop_event)
-            
-            # Spustenie logiky v samostatnom vlákne
-            logic_thread = threading.Thread(target=run_python_logic, args=(logic_py, stop_event))
-            logic_thread.start()
             logic_threads.append(logic_thread)
 
-        # Ak neexistuje python logika, skúšame spustiť binárku (pozastavené pre open-source pristup)
-        #else:
-        #    print(f"Python logika nenájdená v {module_path}, skúšam binárku...")
-        #    run_binary(module_path)
-
     return stop_events, logic_threads
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Volanie hlavnej funkcie ----////
 if __name__ == "__main__":
+    # Potrebné pre worker procesy v skompilovanej (frozen) verzii
+    multiprocessing.freeze_support()
+
+    # --profile-startup[=cesta.json] zapne záznam časovej osi štartu (Chrome trace)
+    if "--profile-startup" in sys.argv or get_cli_option("profile-startup"):
+        startup_profiler.enable(get_cli_option("profile-startup"))
+
+    # --track-memory zapne tracemalloc ešte pred načítaním modulov (alokácie po moduloch)
+    if "--track-memory" in sys.argv:
+        module_stats.enable_memory_tracking()
 
     # Spustiť logiku modulov
     stop_events, logic_threads = main()
 
     # Spustiť GUI aplikáciu
     if "--nogui" not in sys.argv: # Spustiť GUI, ak nie je zadaný parameter --nogui
+        with startup_profiler.span("import gui_main"):
+            import gui_main  # lazy import - Qt sa načíta iba ak GUI naozaj štartuje
+
         # Spustiť GUI aplikáciu s callbackom na ukončenie main.py
-        gui_main.main(on_close_callback=lambda: stop_all_logics(stop_events, logic_threads, exit_app=True))
+        # --watch-module=meno[,meno2] zapne hot reload vybraných modulov
+        watch = get_cli_option("watch-module")
+        gui_main.main(
+            on_close_callback=lambda: stop_all_logics(stop_events, logic_threads, exit_app=True),
+            reload_logic_callback=lambda name: restart_module_logic(name, stop_events, logic_threads),
+            watch_modules=[m for m in watch.split(",") if m] if watch else None,
+        )
+    else:
+        startup_profiler.write_trace()
+        wait_for_logics(stop_events, logic_threads)
 # ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,208 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Module Registry - jeden zdieľaný sken priečinka modules ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Priečinok modules sa prejde iba raz a výsledok (logika, widgety, overlaye, config, assets)
+# sa uloží do indexu na disku. Pri ďalšom štarte sa index overí len cez mtime priečinkov,
+# takže teplý štart nerobí žiadne listdir, iba pár stat volaní.
+
+import os
+import json
+import threading
+
+# ////---- Konštanty ----////
+MODULES_DIR = "modules"
+INDEX_FILE = ".module_index.json"
+INDEX_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+IMAGE_RELPATH = os.path.join("assets", "pictures", "480x320.png")
+# Podpriečinky modulu, ktorých mtime sledujeme (zmena zoznamu súborov = zmena mtime)
+WATCHED_SUBDIRS = ("python", "widgets", "overlays", "config", "assets", os.path.join("assets", "pictures"))
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Pomocné funkcie ----////
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _list_py(path):
+    try:
+        return sorted(f for f in os.listdir(path) if f.endswith(".py"))
+    except OSError:
+        return []
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ModuleRegistry ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class ModuleRegistry:
+    # ////---- Inicializácia ----////
+    def __init__(self, modules_dir=MODULES_DIR, index_path=None):
+        self.modules_dir = modules_dir
+        # Index leží vedľa priečinka modules, nie v ňom - jeho zápis tak nemení mtime modules
+        self.index_path = index_path or os.path.join(os.path.dirname(os.path.normpath(modules_dir)), INDEX_FILE)
+        self._modules = {}  # dict: module_name -> info dict
+        self._lock = threading.Lock()
+        self._scanned = False
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Verejné API ----////
+    def scan(self, force=False):
+        """Načíta moduly z indexu, zmenené moduly preskenuje a index uloží."""
+        with self._lock:
+            if self._scanned and not force:
+                return self._modules
+            if not os.path.exists(self.modules_dir):
+                os.makedirs(self.modules_dir)
+
+            index = None if force else self._read_index()
+            root_mtime = _mtime(self.modules_dir)
+            cached = index["modules"] if index else {}
+
+            # Ak sa mtime priečinka modules nezmenil, zoznam modulov je rovnaký ako v indexe
+            if index and index.get("root_mtime") == root_mtime:
+                names = list(cached.keys())
+            else:
+                names = sorted(
+                    d for d in os.listdir(self.modules_dir)
+                    if not d.startswith((".", "__"))
+                    and os.path.isdir(os.path.join(self.modules_dir, d))
+                )
+
+            modules, changed = {}, index is None
+            for name in names:
+                info = cached.get(name)
+                if info is None or not self._is_fresh(info):
+                    info = self._scan_module(name)
+                    changed = True
+                modules[name] = info
+            if index and set(modules) != set(cached):
+                changed = True
+
+            self._modules = modules
+            self._scanned = True
+            if changed or index.get("root_mtime") != root_mtime:
+                self._write_index(root_mtime)
+            return self._modules
+
+    def rescan_module(self, name):
+        """Preskenuje jeden modul (napr. po zmene súborov) a aktualizuje index."""
+        with self._lock:
+            if os.path.isdir(os.path.join(self.modules_dir, name)):
+                self._modules[name] = self._scan_module(name)
+            else:
+                self._modules.pop(name, None)
+            self._write_index(_mtime(self.modules_dir))
+            return self._modules.get(name)
+
+    def modules(self):
+        return self.scan()
+
+    def names(self):
+        return sorted(self.scan().keys())
+
+    def get(self, name):
+        return self.scan().get(name)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Sken jedného modulu ----////
+    def _scan_module(self, name):
+        path = os.path.join(self.modules_dir, name)
+        logic_path = os.path.join(path, "python", "logic.py")
+        widgets_dir = os.path.join(path, "widgets")
+        overlays_dir = os.path.join(path, "overlays")
+        config_dir = os.path.join(path, "config")
+        image_path = os.path.join(path, IMAGE_RELPATH)
+
+        mtimes = {"": _mtime(path)}
+        for sub in WATCHED_SUBDIRS:
+            mtimes[sub] = _mtime(os.path.join(path, sub))
+        # Manifest je súbor, jeho zmenu obsahu zachytí iba jeho vlastný mtime
+        mtimes[MANIFEST_FILE] = _mtime(os.path.join(path, MANIFEST_FILE))
+
+        try:
+            config_files = sorted(os.listdir(config_dir))
+        except OSError:
+            config_files = []
+
+        manifest = {}
+        if mtimes[MANIFEST_FILE] is not None:
+            try:
+                with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"[ModuleRegistry] Neplatný manifest modulu {name}: {e}")
+
+        return {
+            "name": name,
+            "path": path,
+            "logic": logic_path if os.path.isfile(logic_path) else None,
+            "widgets_dir": widgets_dir,
+            "widgets": _list_py(widgets_dir),
+            "overlays_dir": overlays_dir,
+            "overlays": _list_py(overlays_dir),
+            "config_dir": config_dir,
+            "config": config_files,
+            "image": image_path if os.path.isfile(image_path) else None,
+            "manifest": manifest if isinstance(manifest, dict) else {},
+            "mtimes": mtimes,
+        }
+
+    def _is_fresh(self, info):
+        # Modul je aktuálny, ak sa nezmenil mtime žiadneho sledovaného priečinka
+        path = info["path"]
+        for sub, recorded in info.get("mtimes", {}).items():
+            if _mtime(os.path.join(path, sub) if sub else path) != recorded:
+                return False
+        return True
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Index na disku ----////
+    def _read_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Poškodený alebo ručne upravený index (list, reťazec...) = ako iná verzia -> nový sken
+        if not isinstance(index, dict):
+            return None
+        if index.get("version") != INDEX_VERSION or index.get("modules_dir") != self.modules_dir:
+            return None
+        modules = index.get("modules")
+        if not isinstance(modules, dict) or not all(isinstance(info, dict) for info in modules.values()):
+            return None
+        return index
+
+    def _write_index(self, root_mtime):
+        # Jeden zápis cez dočasný súbor + rename, aby sa index nikdy nepoškodil.
+        # Index je mimo priečinka modules, takže root_mtime zo skenu po zápise stále platí.
+        data = {
+            "version": INDEX_VERSION,
+            "modules_dir": self.modules_dir,
+            "root_mtime": root_mtime,
+            "modules": self._modules,
+        }
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"[ModuleRegistry] Index sa nepodarilo uložiť: {e}")
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_registry_instance = None
+_registry_lock = threading.Lock()
+
+def get_module_registry(modules_dir=MODULES_DIR):
+    global _registry_instance
+    with _registry_lock:
+        if _registry_instance is None or _registry_instance.modules_dir != modules_dir:
+            _registry_instance = ModuleRegistry(modules_dir)
+    return _registry_instance
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,167 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Module Stats - CPU a pamäť po moduloch ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# CPU:     vlákno modulu -> /proc/self/task/<native_id>/stat (Linux), tick -> súčet
+#          thread_time() jeho tickov, proces modulu -> /proc/<pid>/stat (Linux).
+#          Async moduly zdieľajú jedno vlákno, ich CPU je v riadku "[asyncio]".
+# Pamäť:   tracemalloc (iba s parametrom --track-memory) filtrovaný podľa cesty modulu.
+# Objekty: počet živých inštancií tried definovaných v súboroch modulu (gc.get_objects).
+# Nesmie importovať Qt - dump funguje aj v režime --nogui.
+
+import os
+import gc
+import json
+import time
+import threading
+import tracemalloc
+
+import bytecode_cache
+from module_registry import get_module_registry
+
+# ////---- Konštanty ----////
+ASYNC_ROW = "[asyncio]"
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Zapnutie sledovania alokácií (čím skôr, tým presnejšie) ----////
+def enable_memory_tracking(frames=1):
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- CPU čas jednotlivých typov handle ----////
+def _proc_stat_cpu_time(stat_path):
+    try:
+        with open(stat_path, "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime a stime sú 14. a 15. pole (po odrezaní "pid (comm)" sú na indexe 11 a 12)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def _thread_cpu_time(thread):
+    # Iba cez /proc podľa native_id - pthread_getcpuclockid(thread.ident) by pri vlákne, ktoré
+    # medzitým skončilo, dostal neplatný pthread_t (nedefinované správanie, pád loadera).
+    # Čítanie /proc skončeného vlákna iba zlyhá. Inde (napr. Windows) per-thread CPU nie je.
+    if thread is None:
+        return None
+    native_id = getattr(thread, "native_id", None)
+    if native_id is None:
+        return None
+    return _proc_stat_cpu_time(f"/proc/self/task/{native_id}/stat")
+
+def _process_cpu_time(pid):
+    return _proc_stat_cpu_time(f"/proc/{pid}/stat")
+
+def _handle_kind_and_cpu(handle):
+    if hasattr(handle, "process"):  # process_runner.LogicProcess
+        return "process", _process_cpu_time(handle.process.pid) if handle.process.pid else None
+    if hasattr(handle, "ctx"):  # logic_scheduler.TickJob
+        return "tick", handle.cpu_time
+    if hasattr(handle, "future"):  # async_runtime.AsyncJob
+        return "async", None
+    return "thread", _thread_cpu_time(handle) if handle.is_alive() else None
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ModuleStats ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class ModuleStats:
+    # ////---- Inicializácia ----////
+    def __init__(self, modules_dir="modules"):
+        self.registry = get_module_registry(modules_dir)
+        self._logic_threads = []
+        self._last_cpu = {}  # meno -> (cpu_time, monotonic) z posledného zberu
+        self.last_stats = {}
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zoznam handle logík z main.py (ten istý list, mení sa pri hot reloade) ----////
+    def track(self, logic_threads):
+        self._logic_threads = logic_threads
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zber štatistík ----////
+    def collect(self, count_objects=True):
+        now = time.monotonic()
+        stats = {name: {"kind": None, "cpu_time": None, "cpu_percent": None,
+                        "alloc_bytes": None, "alloc_blocks": None, "objects": None}
+                 for name in self.registry.names()}
+
+        # CPU
+        for handle in list(self._logic_threads):
+            kind, cpu = _handle_kind_and_cpu(handle)
+            row = stats.setdefault(handle.name, {})
+            row["kind"], row["cpu_time"] = kind, cpu
+        async_thread = next((t for t in threading.enumerate() if t.name == "logic-asyncio"), None)
+        if async_thread is not None:
+            stats[ASYNC_ROW] = {"kind": "async", "cpu_time": _thread_cpu_time(async_thread)}
+        for name, row in stats.items():
+            cpu = row.get("cpu_time")
+            prev = self._last_cpu.get(name)
+            if cpu is not None:
+                if prev and now > prev[1]:
+                    row["cpu_percent"] = max(0.0, (cpu - prev[0]) / (now - prev[1]) * 100.0)
+                self._last_cpu[name] = (cpu, now)
+
+        # Pamäť - jeden snapshot, rozdelený podľa cesty súboru
+        if tracemalloc.is_tracing():
+            self._collect_allocations(stats)
+
+        # Počty objektov podľa __module__ triedy ("<modul>.python.logic", "<modul>.<widget>"...)
+        if count_objects:
+            self._collect_objects(stats)
+
+        self.last_stats = stats
+        return stats
+
+    def _collect_allocations(self, stats):
+        prefixes = []
+        for name, info in self.registry.modules().items():
+            for path in {info["path"], os.path.abspath(info["path"])}:
+                prefixes.append((path + os.sep, name))
+            stats[name]["alloc_bytes"], stats[name]["alloc_blocks"] = 0, 0
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics("filename"):
+            filename = stat.traceback[0].filename
+            for prefix, name in prefixes:
+                if filename.startswith(prefix):
+                    stats[name]["alloc_bytes"] += stat.size
+                    stats[name]["alloc_blocks"] += stat.count
+                    break
+
+    def _collect_objects(self, stats):
+        # Iba súbory načítané cez bytecode_cache - modul "json" tak nezapočíta triedy z json.decoder
+        owners = {mod: mod.split(".", 1)[0] for mod in bytecode_cache.loaded_module_names()}
+        counts = {}
+        for obj in gc.get_objects():
+            owner = owners.get(getattr(type(obj), "__module__", None))
+            if owner:
+                counts[owner] = counts.get(owner, 0) + 1
+        for name in self.registry.names():
+            stats[name]["objects"] = counts.get(name, 0)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Strojovo čitateľný výstup ----////
+    def dump_json(self, path, collect=True):
+        stats = self.collect() if collect else self.last_stats
+        data = {"timestamp": time.time(), "pid": os.getpid(),
+                "memory_tracking": tracemalloc.is_tracing(), "modules": stats}
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            print(f"[module_stats] Štatistiky uložené do {path}")
+        except OSError as e:
+            print(f"[module_stats] Štatistiky sa nepodarilo uložiť: {e}")
+        return data
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_stats_instance = None
+
+def get_module_stats():
+    global _stats_instance
+    if _stats_instance is None:
+        _stats_instance = ModuleStats()
+    return _stats_instance
+# ////-----------------------------------------------------------------------------------------
@@ -4,11 +4,100 @@
 
 import os
 import sys
-import json
-import importlib.util
+import bytecode_cache
+import config_cache
+import widget_lifecycle
 from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from shortcut_manager import get_bridge
+from module_registry import get_module_registry
+from settings_store import get_settings_store
+import startup_profiler
+from startup_profiler import span
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Write-behind úložisko pozícií overlayov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pozície sa menia v pamäti, do SQLite (settings_store) idú až FLUSH_DELAY_MS po poslednej
+# zmene (alebo hneď pri pustení myši / ukončení) - iba zmenené kľúče, v jednej transakcii.
+# Staré config/python_overlays.json sa pri prvom štarte jednorazovo importuje.
+# Custom overlaye vytvára modul z vlastného config/custom_overlays.json - ich pozície sa preto
+# zapisujú späť do tohto súboru (rovnako odložene), aby ich modul pri ďalšom štarte videl.
+
+# ////---- Konštanty ----////
+FLUSH_DELAY_MS = 500
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- OverlayPositionStore ----////
+class OverlayPositionStore:
+    def __init__(self, modules_dir="modules"):
+        self.modules_dir = modules_dir
+        self.store = get_settings_store()
+        self.store.migrate_modules(modules_dir, get_module_registry(modules_dir).names())
+        self._items = {}  # (modul, položka) -> dict nastavení (cache bodových čítaní)
+        self._dirty = {}  # (modul, položka) -> {kľúč: hodnota} čakajúce na zápis
+        self._custom_dirty = {}  # modul -> {overlay: {kľúč: hodnota}} pre custom_overlays.json
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(FLUSH_DELAY_MS)
+        self._timer.timeout.connect(self.flush)
+
+    def _item(self, module, item):
+        key = (module, item)
+        values = self._items.get(key)
+        if values is None:
+            values = self._items[key] = self.store.get_item(module, item)
+        return values
+
+    # ////---- Čítanie ----////
+    def get(self, module, item):
+        return self._item(module, item) or None
+
+    # ////---- Zmena v pamäti + odložený zápis ----////
+    def update(self, module, item, params):
+        current = self._item(module, item)
+        changed = {k: v for k, v in params.items() if current.get(k) != v}
+        if not changed:
+            return  # nič sa nezmenilo - žiadny zápis
+        current.update(changed)
+        self._dirty.setdefault((module, item), {}).update(changed)
+        self._timer.start()  # reštart timera = debounce
+
+    def update_custom(self, module, overlay, params):
+        # Custom overlay - zapisuje sa do custom_overlays.json modulu pri flush
+        self._custom_dirty.setdefault(module, {}).setdefault(overlay, {}).update(params)
+        self._timer.start()
+
+    # ////---- Zápis zmenených kľúčov ----////
+    def flush(self):
+        self._timer.stop()
+        if self._dirty:
+            dirty, self._dirty = self._dirty, {}
+            try:
+                self.store.set_many([(module, item, values) for (module, item), values in dirty.items()])
+            except Exception as e:
+                print(f"[OverlayManager] Nepodarilo sa uložiť pozície overlayov: {e}")
+        if self._custom_dirty:
+            custom_dirty, self._custom_dirty = self._custom_dirty, {}
+            for module, overlays in custom_dirty.items():
+                self._flush_custom(module, overlays)
+
+    def _flush_custom(self, module, overlays):
+        # Súbor sa načíta tesne pred zápisom (cache podľa mtime) - zmeny, ktoré medzitým urobil
+        # modul, ostanú zachované; aktualizujú sa iba existujúce overlaye
+        path = os.path.join(self.modules_dir, module, "config", "custom_overlays.json")
+        data = config_cache.load_json(path, copy=True)
+        if not isinstance(data, dict):
+            return
+        changed = False
+        for overlay, params in overlays.items():
+            entry = data.get(overlay)
+            if isinstance(entry, dict) and any(entry.get(k) != v for k, v in params.items()):
+                entry.update(params)
+                changed = True
+        if changed:
+            config_cache.save_json(path, data)
+# ////-----------------------------------------------------------------------------------------
 
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Overlay window class ----////
@@ -27,6 +116,7 @@ class OverlayWindow(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0,0,0,0)
         layout.addWidget(widget)
+        self.widget = widget
         self.edit_mode = False
         self.drag_pos = None
         self.resizing = False
@@ -48,6 +138,12 @@ class OverlayWindow(QWidget):
         effective = show and self.user_visible
         self.overlay_visible = effective
         self.setVisible(effective)
+        self.sync_lifecycle()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Skrytý overlay sa uspí (timery, on_suspend), zobrazený prebudí ----////
+    def sync_lifecycle(self):
+        widget_lifecycle.set_active(self.widget, self.isVisible())
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Funkcia pre režim úprav ----////
@@ -76,17 +172,20 @@ class OverlayWindow(QWidget):
         if self.edit_mode and self.drag_pos:
             new_pos = event.globalPosition().toPoint() - self.drag_pos
             self.move(new_pos)
-            self.manager.save_overlay_positions()
+            self.manager.mark_position_dirty(self)
         if self.edit_mode and self.resizing:
             delta = event.globalPosition().toPoint() - self.resize_start
             new_w = max(100, self.start_geom.width() + delta.x())
             new_h = max(50, self.start_geom.height() + delta.y())
             self.resize(new_w, new_h)
-            self.manager.save_overlay_positions()
+            self.manager.mark_position_dirty(self)
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Funkcia pre ukončenie presunu/zmeny veľkosti ----////
     def mouseReleaseEvent(self, event):
+        if self.drag_pos or self.resizing:
+            self.manager.mark_position_dirty(self)
+            self.manager.flush_positions()  # koniec ťahania - uložiť hneď, nečakať na debounce
         self.drag_pos = None
         self.resizing = False
     # ////-------------------------------------------------------------------------------------
@@ -97,15 +196,38 @@ class OverlayWindow(QWidget):
             self.manager.remove_overlay(self.name)
     # ////-------------------------------------------------------------------------------------
 
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Overlay descriptor - overlay, ktorý ešte nemusí mať okno ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pri štarte sa pre každý overlay vytvorí iba descriptor (cesta + uložené params). Súbor sa
+# importuje a OverlayWindow vytvorí až keď má byť overlay prvýkrát viditeľný (global_show
+# a user_visible) alebo v edit režime. Skryté overlaye tak nestoja natívne okno ani timery.
+class OverlayDescriptor:
+    __slots__ = ("name", "module_name", "file_path", "params", "failed")
+
+    def __init__(self, name, module_name, file_path, params):
+        self.name = name
+        self.module_name = module_name
+        self.file_path = file_path
+        self.params = params
+        self.failed = False  # create_overlay zlyhal - neskúšať znova až do hot reloadu
+
+    @property
+    def user_visible(self):
+        return self.params.get("user_visible", True)
+# ////-----------------------------------------------------------------------------------------
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- Overlay Manager Class ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
 class OverlayManager:
     def __init__(self):
         self.app = QApplication.instance() or QApplication(sys.argv)
-        self.overlays = {}  # Meno -> OverlayWindow
+        self.overlays = {}  # Meno -> OverlayWindow (iba už vytvorené)
+        self.descriptors = {}  # Meno -> OverlayDescriptor (všetky nainštalované)
         self.global_show = True
         self.edit_mode = False
+        self.positions = OverlayPositionStore()
 
         # ---- QtBridge signály ----
         self.bridge = get_bridge()
@@ -126,33 +248,70 @@ class OverlayManager:
         # self.stop_event = None # nie je momentálne používané
 
     # ////---- Načíta všetky overlaye z každého modulu ----////
+    @startup_profiler.profiled("OverlayManager.load_all_overlays")
     def load_all_overlays(self, modules_dir="modules"):
-        for module_name in os.listdir(modules_dir):
-            overlays_dir = os.path.join(modules_dir, module_name, "overlays")
-            if not os.path.isdir(overlays_dir):
+        # Zoznam overlayov berieme zo zdieľaného registra modulov (žiadny ďalší listdir)
+        for module_name, info in get_module_registry(modules_dir).modules().items():
+            self.load_module_overlays(module_name, info)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zaregistruje overlaye jedného modulu (okná vzniknú až pri zobrazení) ----////
+    def load_module_overlays(self, module_name, info):
+        # Pre každý .py súbor v overlays zložke
+        for fname in info["overlays"]:
+            file_path = os.path.join(info["overlays_dir"], fname)
+            overlay_name = f"{module_name}:{fname}"
+
+            # Default hodnoty
+            default_params = {"x":100,"y":100,"w":400,"h":200,"bg":"rgba(0,0,0,0)"}
+            # Načítaj uložené pozície (prepíšu defaulty)
+            with span("overlay.load_position", overlay=overlay_name):
+                params = self.load_overlay_position(module_name, fname, default_params)
+            self.descriptors[overlay_name] = OverlayDescriptor(overlay_name, module_name, file_path, params)
+        self.materialize_overlays()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Má overlay práve teraz existovať ako okno? ----////
+    def _should_materialize(self, desc):
+        return self.edit_mode or (self.global_show and desc.user_visible)
+
+    # ////---- Vytvorí okná overlayov, ktoré majú byť viditeľné a ešte neexistujú ----////
+    def materialize_overlays(self):
+        for name, desc in list(self.descriptors.items()):
+            if name in self.overlays or desc.failed or not self._should_materialize(desc):
                 continue
-            # Pre každý .py súbor v overlays zložke
-            for fname in os.listdir(overlays_dir):
-                if fname.endswith(".py"):
-                    file_path = os.path.join(overlays_dir, fname)
-                    overlay_name = f"{module_name}:{fname}"
-
-                    # Default hodnoty
-                    default_params = {"x":100,"y":100,"w":400,"h":200,"bg":"rgba(0,0,0,0)"}
-                    # Načítaj uložené pozície (prepíšu defaulty)
-                    params = self.load_overlay_position(module_name, fname, default_params)
-                    # Načítaj widget z overlay súboru
-                    widget = self.load_overlay_widget(file_path, module_name, params)
-                    if widget:
-                        self.add_overlay(widget, overlay_name, params, module_name)
+            # Načítaj widget z overlay súboru (exec_module + create_overlay)
+            with span("overlay.create_overlay", overlay=name):
+                widget = self.load_overlay_widget(desc.file_path, desc.module_name, desc.params)
+            if not widget:
+                desc.failed = True
+                continue
+            with span("overlay.add_overlay", overlay=name):
+                self.add_overlay(widget, name, desc.params, desc.module_name)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zatvorí overlaye jedného modulu (hot reload) ----////
+    def unload_module_overlays(self, module_name):
+        self.save_overlay_positions()  # aktuálne pozície si nový overlay načíta z configu
+        for name in [n for n, desc in self.descriptors.items() if desc.module_name == module_name]:
+            del self.descriptors[name]
+        for name in [n for n, win in self.overlays.items() if win.module_name == module_name]:
+            win = self.overlays.pop(name)
+            try:
+                if hasattr(win.widget, "close_widget"):
+                    win.widget.close_widget()
+                win.close()
+                win.deleteLater()
+            except Exception as e:
+                print(f"[OverlayManager] Chyba pri zatváraní overlay {name}: {e}")
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Načíta overlay widget z daného súboru ----////
     def load_overlay_widget(self, file_path, module_name, params):
-        spec = importlib.util.spec_from_file_location("overlay", file_path)
-        mod = importlib.util.module_from_spec(spec)
+        # Unikátne meno modulu, aby sa overlaye rôznych modulov neprepisovali v sys.modules
+        mod_key = f"{module_name}.overlays.{os.path.splitext(os.path.basename(file_path))[0]}"
         try:
-            spec.loader.exec_module(mod)
+            mod = bytecode_cache.load_source_module(mod_key, file_path)
             if hasattr(mod, "create_overlay"):
                 return mod.create_overlay(params)   # <-- tu už posielam celé params
         except Exception as e:
@@ -163,12 +322,16 @@ class OverlayManager:
     # ////---- Uloží aktuálny overlay ako vlastný ----////
     def add_overlay(self, widget, name, params, module_name):
         win = OverlayWindow(widget, name, params, self, module_name)
-        win.show() if self.global_show else win.hide()
+        win.set_overlay_visible(self.global_show)
+        if self.edit_mode:
+            win.set_edit_mode(True)  # overlay pridaný počas edit režimu (napr. po hot reloade)
+            win.sync_lifecycle()
         self.overlays[name] = win
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Odstráni overlay podľa mena ----////
     def remove_overlay(self, name):
+        self.descriptors.pop(name, None)
         if name in self.overlays:
             self.overlays[name].close()
             del self.overlays[name]
@@ -179,6 +342,7 @@ class OverlayManager:
     def set_global_show(self, show: bool):
         print(f"[OverlayManager] set_global_show({show})")
         self.global_show = show
+        self.materialize_overlays()
         for win in self.overlays.values():
             win.set_overlay_visible(show)
     # ////-------------------------------------------------------------------------------------
@@ -229,6 +393,7 @@ class OverlayManager:
     def toggle_global_show(self):
         print("[OverlayManager] toggle_global_show() called")
         self.global_show = not self.global_show
+        self.materialize_overlays()
         for win in self.overlays.values():
             win.set_overlay_visible(self.global_show)
     # ////-------------------------------------------------------------------------------------
@@ -237,95 +402,49 @@ class OverlayManager:
     def toggle_edit_mode(self):
         print("[OverlayManager] toggle_edit_mode() called")
         self.edit_mode = not self.edit_mode
+        self.materialize_overlays()  # v edit režime sa zobrazia aj skryté overlaye
         for win in self.overlays.values():
             win.set_edit_mode(self.edit_mode)
             effective = self.global_show and win.user_visible
             win.setVisible(effective or self.edit_mode)
+            win.sync_lifecycle()  # po edit režime sa skryté overlaye znova uspia
     # ////-------------------------------------------------------------------------------------
 
-    # ////---- Uloží pozície všetkých overlayov do súborov ----////
-    def save_overlay_positions(self):
-        positions_by_module = {}
-        custom_positions_by_module = {}
-
-        for name, win in self.overlays.items():
-            geo = win.geometry()
-            new_params = {
-                "x": geo.x(), "y": geo.y(),
-                "w": geo.width(), "h": geo.height(),
-                "bg": win.params.get("bg", "rgba(0,0,0,0)"),
-                "user_visible": win.user_visible
-            }
-
-            if ":" in name:
-                module, overlay = name.split(":", 1)
-
-                # ---- klasické overlaye (overlay.py súbory) ----
-                if overlay.endswith(".py"):
-                    if module not in positions_by_module:
-                        positions_by_module[module] = {}
-                    positions_by_module[module][overlay] = new_params
-
-                # ---- custom overlays (custom_overlays.json) ----
-                else:
-                    if module not in custom_positions_by_module:
-                        custom_positions_by_module[module] = {}
-                    custom_positions_by_module[module][overlay] = new_params
-
-        # Ulož klasické overlaye
-        for module, overlays in positions_by_module.items():
-            config_dir = os.path.join("modules", module, "config")
-            os.makedirs(config_dir, exist_ok=True)
-            path = os.path.join(config_dir, "python_overlays.json")
-            try:
-                if os.path.exists(path):
-                    with open(path, "r") as f:
-                        old_data = json.load(f)
-                else:
-                    old_data = {}
-            except Exception:
-                old_data = {}
-            old_data.update(overlays)
-            with open(path, "w") as f:
-                json.dump(old_data, f, indent=2)
-
-        # Ulož custom overlays
-        for module, overlays in custom_positions_by_module.items():
-            config_dir = os.path.join("modules", module, "config")
-            os.makedirs(config_dir, exist_ok=True)
-            path = os.path.join(config_dir, "custom_overlays.json")
-            try:
-                if os.path.exists(path):
-                    with open(path, "r") as f:
-                        old_data = json.load(f)
-                else:
-                    old_data = {}
-            except Exception:
-                old_data = {}
-
-            # update existujúcich custom overlays
-            for overlay_name, params in overlays.items():
-                if overlay_name in old_data:
-                    old_data[overlay_name].update(params)
+    # ////---- Pozícia jedného overlayu -> úložisko (zápis na disk je odložený) ----////
+    def mark_position_dirty(self, win):
+        if ":" not in win.name:
+            return
+        module, overlay = win.name.split(":", 1)
+        geo = win.geometry()
+        new_params = {
+            "x": geo.x(), "y": geo.y(),
+            "w": geo.width(), "h": geo.height(),
+            "bg": win.params.get("bg", "rgba(0,0,0,0)"),
+            "user_visible": win.user_visible
+        }
+        # ---- klasické overlaye (overlay.py súbory) ----
+        if overlay.endswith(".py"):
+            self.positions.update(module, overlay, new_params)
+        # ---- custom overlays (custom_overlays.json modulu) - iba update existujúcich ----
+        else:
+            self.positions.update_custom(module, overlay, new_params)
 
-            with open(path, "w") as f:
-                json.dump(old_data, f, indent=2)
+    def flush_positions(self):
+        self.positions.flush()
+    # ////-------------------------------------------------------------------------------------
 
+    # ////---- Uloží pozície všetkých overlayov (iba zmenené kľúče) ----////
+    def save_overlay_positions(self):
+        for win in self.overlays.values():
+            self.mark_position_dirty(win)
+        self.flush_positions()
     # ////-------------------------------------------------------------------------------------
 
-    # ////---- Načíta pozíciu overlayu z konfiguračného súboru ----////
+    # ////---- Načíta pozíciu overlayu (bodové čítanie zo settings store) ----////
     def load_overlay_position(self, module, overlay, default_params):
-        path = os.path.join("modules", module, "config", "python_overlays.json")
-        if os.path.exists(path):
-            try:
-                with open(path, "r") as f:
-                    data = json.load(f)
-                    if overlay in data:
-                        return data[overlay]
-            except Exception:
-                pass
-        return default_params
-      
+        params = self.positions.get(module, overlay)
+        return dict(params) if params else default_params
+
     # ////---- Stop overlay managera ----////
     def stop(self):
         for win in list(self.overlays.values()):
@@ -335,6 +454,7 @@ class OverlayManager:
                 pass
         self.save_overlay_positions()
         self.overlays.clear()
+        self.descriptors.clear()
         # self.stop_event = True # nie je momentálne používané
     # ////-------------------------------------------------------------------------------------
 
@@ -0,0 +1,156 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Process Runner - logika modulu v samostatnom procese ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Každý logic.py beží vo vlastnom worker procese (vlastný GIL, pád modulu neshodí loader).
+# stop_event je medziprocesový multiprocessing.Event, výsledky a chyby sa vracajú cez Pipe.
+# Coroutine logika (async def) beží vo workeri cez asyncio.run s awaitable AsyncStopEvent.
+# data_bus.publish vo workeri sa tiež posiela cez Pipe a v hlavnom procese sa publikuje ďalej.
+# Pozor: tento súbor sa importuje aj vo worker procese, preto nesmie importovať Qt ani pynput.
+
+import asyncio
+import inspect
+import threading
+import traceback
+import multiprocessing
+from collections import deque
+
+import bytecode_cache
+import data_bus
+import async_runtime
+
+# ////---- Konštanty ----////
+ISOLATION_THREAD = "thread"
+ISOLATION_PROCESS = "process"
+ISOLATION_MODES = (ISOLATION_THREAD, ISOLATION_PROCESS)
+# spawn je bezpečný aj s bežiacim Qt a pynput vláknami a správa sa rovnako na Windows aj Linux
+_context = multiprocessing.get_context("spawn")
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Vytvorenie medziprocesového stop eventu ----////
+def create_stop_event():
+    return _context.Event()
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Worker - beží v samostatnom procese ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_send_lock = threading.Lock()  # modul môže posielať z viacerých vlákien, Pipe nie je thread-safe
+
+def _send(conn, message):
+    with _send_lock:
+        try:
+            conn.send(message)
+        except Exception:
+            # Výsledok sa nedá picklovať -> pošleme aspoň jeho repr
+            try:
+                if message[0] == "publish":
+                    conn.send(("publish", (message[1][0], repr(message[1][1]))))
+                else:
+                    conn.send((message[0], repr(message[1])))
+            except Exception:
+                pass
+
+def _worker_main(module_name, logic_path, stop_event, conn):
+    try:
+        data_bus.get_data_bus().set_forwarder(lambda topic, value: _send(conn, ("publish", (topic, value))))
+        logic = bytecode_cache.load_source_module(f"{module_name}.python.logic", logic_path)
+
+        # Modul môže priebežne posielať výsledky, ak jeho logic_main_init prijíma send_result
+        def send_result(value):
+            _send(conn, ("result", value))
+
+        result = None
+        if async_runtime.is_async_logic(logic):
+            # async def logic_main_init / main - vlastný asyncio loop vo workeri
+            result = asyncio.run(_run_async_logic(logic, stop_event, send_result))
+        elif hasattr(logic, "logic_main_init"):
+            kwargs = {"stop_event": stop_event}
+            if "send_result" in inspect.signature(logic.logic_main_init).parameters:
+                kwargs["send_result"] = send_result
+            result = logic.logic_main_init(**kwargs)
+        elif hasattr(logic, "main"):
+            result = logic.main()
+        _send(conn, ("done", result))
+    except Exception:
+        _send(conn, ("error", traceback.format_exc()))
+    finally:
+        conn.close()
+
+async def _run_async_logic(logic, stop_event, send_result):
+    # Modul dostane AsyncStopEvent (awaitable wait) ako v async_runtime; medziprocesový
+    # stop_event ho nastaví cez pomocné vlákno
+    async_stop = async_runtime.AsyncStopEvent(asyncio.get_running_loop())
+    threading.Thread(target=lambda: (stop_event.wait(), async_stop.set()),
+                     name="logic-stop-relay", daemon=True).start()
+    if hasattr(logic, "logic_main_init"):
+        kwargs = {"stop_event": async_stop}
+        if "send_result" in inspect.signature(logic.logic_main_init).parameters:
+            kwargs["send_result"] = send_result
+        return await logic.logic_main_init(**kwargs)
+    return await logic.main()
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- LogicProcess - handle s rovnakým rozhraním ako threading.Thread ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class LogicProcess:
+    # ////---- Inicializácia ----////
+    def __init__(self, module_name, logic_path, stop_event):
+        self.name = module_name
+        self.logic_path = logic_path
+        self.stop_event = stop_event
+        self.results = deque(maxlen=100)  # posledné výsledky poslané z workera
+        self.error = None
+        self._conn, child_conn = _context.Pipe(duplex=False)
+        self._child_conn = child_conn
+        self.process = _context.Process(
+            target=_worker_main,
+            args=(module_name, logic_path, stop_event, child_conn),
+            name=f"logic:{module_name}",
+        )
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Štart a čítanie výsledkov ----////
+    def start(self):
+        self.process.start()
+        self._child_conn.close()  # koniec pipe patrí už iba workeru
+        threading.Thread(target=self._reader_loop, name=f"logic-pipe:{self.name}", daemon=True).start()
+
+    def _reader_loop(self):
+        while True:
+            try:
+                kind, value = self._conn.recv()
+            except (EOFError, OSError):
+                break
+            if kind == "publish":
+                data_bus.publish(*value)
+            elif kind == "result":
+                self.results.append(value)
+            elif kind == "done":
+                if value is not None:
+                    self.results.append(value)
+            elif kind == "error":
+                self.error = value
+                print(f"Chyba pri spustení logiky {self.logic_path} (proces):\n{value}")
+
+        # Pipe sa zavrel - worker skončil (alebo spadol bez správy)
+        self.process.join()
+        code = self.process.exitcode
+        if code not in (0, None) and self.error is None and not self.stop_event.is_set():
+            print(f"[process_runner] Proces logiky {self.name} spadol (exit code {code})")
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Rozhranie ako threading.Thread ----////
+    def join(self, timeout=None):
+        self.process.join(timeout)
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def terminate(self):
+        if self.process.is_alive():
+            self.process.terminate()
+
+    def latest_result(self):
+        return self.results[-1] if self.results else None
+    # ////-------------------------------------------------------------------------------------
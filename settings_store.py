@@ -0,0 +1,202 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Settings Store - nastavenia modulov v jednej SQLite databáze (WAL) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Kľúč je (modul, položka, kľúč): položka = overlay/widget (napr. "graf.py") alebo config
+# modulu ("config:nastavenia.json"), kľúč = jednotlivé nastavenie ("x", "w", "bg"...).
+# Hodnoty sú uložené ako JSON text. Čítanie aj zápis sú bodové operácie nad primárnym
+# kľúčom, nie prepis celého súboru.
+#
+# Widgety:  self.get_setting(kľúč) / self.set_setting(kľúč, hodnota), load_config/save_config
+# Logika:   store = settings_store.get_settings_store(); store.get(modul, položka, kľúč)
+#
+# Staré config/python_overlays.json sa importuje automaticky (migrate_modules), každý súbor
+# iba raz - potom je zdrojom pravdy databáza a neskoršia zmena JSON už nič neprepíše.
+# config/custom_overlays.json patrí modulu (vytvára z neho vlastné overlaye), do databázy
+# sa neimportuje - pozície do neho zapisuje priamo overlay manager.
+# Nesmie importovať Qt.
+
+import os
+import json
+import sqlite3
+import threading
+
+import config_cache
+
+# ////---- Konštanty ----////
+# Mimo priečinka modules: -wal/-shm súbory vznikajú a zanikajú pri každom behu a menili by
+# mtime priečinka modules, čím by module_registry pri každom štarte robil listdir
+DEFAULT_DB_PATH = ".settings.db"
+SCHEMA_VERSION = 1
+CONFIG_PREFIX = "config:"  # položka pre celý config súbor modulu (BaseWidget.save_config)
+LEGACY_FILES = {
+    "python_overlays.json": "",  # overlay "graf.py" -> položka "graf.py"
+}
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- SettingsStore ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class SettingsStore:
+    # ////---- Inicializácia ----////
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self._lock = threading.Lock()  # jedno spojenie zdieľané vláknami (GUI aj logika)
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # vo WAL bezpečné, fsync iba pri checkpointe
+        self._create_schema()
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Schéma ----////
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS settings (
+                    module TEXT NOT NULL,
+                    item   TEXT NOT NULL,
+                    key    TEXT NOT NULL,
+                    value  TEXT NOT NULL,
+                    PRIMARY KEY (module, item, key)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS migrations (
+                    path     TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL
+                ) WITHOUT ROWID;
+            """)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Čítanie ----////
+    def get(self, module, item, key, default=None):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM settings WHERE module=? AND item=? AND key=?", (module, item, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def get_item(self, module, item):
+        """Všetky kľúče jednej položky ako dict (prázdny, ak položka neexistuje)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, value FROM settings WHERE module=? AND item=?", (module, item)
+            ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def items(self, module, prefix=""):
+        """Mená položiek modulu (voliteľne iba s daným prefixom)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT item FROM settings WHERE module=? AND substr(item, 1, ?)=?",
+                (module, len(prefix), prefix),
+            ).fetchall()
+        return [row[0] for row in rows]
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zápis ----////
+    def set(self, module, item, key, value):
+        self.set_many([(module, item, {key: value})])
+
+    def set_item(self, module, item, values):
+        self.set_many([(module, item, values)])
+
+    def set_many(self, updates):
+        """updates: [(modul, položka, {kľúč: hodnota})] - všetko v jednej transakcii."""
+        rows = [(module, item, key, json.dumps(value))
+                for module, item, values in updates for key, value in values.items()]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:  # BEGIN ... COMMIT
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO settings (module, item, key, value) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (module, item, key) DO UPDATE SET value=excluded.value",
+                    rows,
+                )
+
+    def replace_item(self, module, item, values):
+        """Nahradí celú položku (kľúče, ktoré vo values nie sú, zaniknú) v jednej transakcii."""
+        rows = [(module, item, key, json.dumps(value)) for key, value in values.items()]
+        with self._lock:
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.execute("DELETE FROM settings WHERE module=? AND item=?", (module, item))
+                self._conn.executemany("INSERT INTO settings (module, item, key, value) VALUES (?, ?, ?, ?)", rows)
+
+    def delete_item(self, module, item):
+        with self._lock:
+            self._conn.execute("DELETE FROM settings WHERE module=? AND item=?", (module, item))
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Migrácia zo starých JSON súborov ----////
+    def import_json(self, module, path, item_prefix=""):
+        """Jednorazovo importuje {overlay: {kľúč: hodnota}} zo súboru (ďalšie volania nič nerobia)."""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        key = os.path.abspath(path)
+        with self._lock:
+            row = self._conn.execute("SELECT mtime_ns FROM migrations WHERE path=?", (key,)).fetchone()
+        if row:
+            return False  # už migrovaný - novšie dáta v databáze sa nesmú prepísať starým JSON
+
+        data = config_cache.load_json(path)
+        if data is None:
+            return False
+        updates = [(module, f"{item_prefix}{name}", values)
+                   for name, values in (data.items() if isinstance(data, dict) else ())
+                   if isinstance(values, dict)]
+        self.set_many(updates)
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO migrations (path, mtime_ns) VALUES (?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET mtime_ns=excluded.mtime_ns",
+                (key, mtime_ns),
+            )
+        print(f"[SettingsStore] Importované {path} ({len(updates)} položiek)")
+        return True
+
+    def migrate_modules(self, modules_dir="modules", module_names=None):
+        """Importuje legacy JSON configy všetkých (alebo vybraných) modulov."""
+        if module_names is None:
+            try:
+                module_names = [d for d in os.listdir(modules_dir) if os.path.isdir(os.path.join(modules_dir, d))]
+            except OSError:
+                return
+        for module in module_names:
+            for filename, prefix in LEGACY_FILES.items():
+                self.import_json(module, os.path.join(modules_dir, module, "config", filename), prefix)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zatvorenie ----////
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            self._conn.close()
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Globálna inštancia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_store_instance = None
+_store_lock = threading.Lock()
+
+def get_settings_store(db_path=DEFAULT_DB_PATH):
+    global _store_instance
+    with _store_lock:
+        if _store_instance is None:
+            _store_instance = SettingsStore(db_path)
+        return _store_instance
+
+def close_settings_store():
+    global _store_instance
+    with _store_lock:
+        if _store_instance is not None:
+            _store_instance.close()
+            _store_instance = None
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,248 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Shm Channel - ring buffer v zdieľanej pamäti pre rýchle číselné dáta ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Pre tisíce vzoriek za sekundu (grafy v overlayoch) - bez picklovania a bez súborov v data/.
+# Kanál = multiprocessing.shared_memory s hlavičkou a pevným záznamom (struct formát),
+# jeden zapisovateľ (logika) a ľubovoľný počet čitateľov (widgety, overlaye). Funguje
+# rovnako pre logiku vo vlákne aj v samostatnom procese, čitateľ dáta nekopíruje.
+#
+# Loader vytvorí kanály z manifest.json modulu a zruší ich pri ukončení:
+#   "channels": {"samples": {"format": "<dd", "capacity": 65536}}
+# Logika:   ch = shm_channel.open_channel("<modul>", "samples"); ch.write(t, value)
+# Overlay:  ch = shm_channel.open_channel("<modul>", "samples"); view = ch.as_array()
+#           segments, cursor, lost = ch.read_since(cursor)
+# Každé open_channel vráti vlastné pripojenie - jeho close() neovplyvní ostatných čitateľov
+# ani zapisovateľa, segment zruší iba loader (release_all_channels).
+#
+# Layout: [hlavička 64 B][capacity * record_size B]
+# Hlavička: magic, verzia, record_size, capacity, write_index (u64, počet zapísaných záznamov),
+# formát záznamu. Zapisovateľ zapíše záznam a až potom posunie write_index.
+# Nesmie importovať Qt (importuje sa aj vo worker procese).
+
+import atexit
+import struct
+import hashlib
+import weakref
+import threading
+import multiprocessing
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:  # numpy je voliteľné - bez neho čitateľ dostane memoryview
+    np = None
+
+# ////---- Konštanty ----////
+MAGIC = b"JSHM"
+VERSION = 1
+HEADER_SIZE = 64
+_HEADER = struct.Struct("<4sIIIQ32s")  # magic, verzia, record_size, capacity, write_index, formát
+_WRITE_INDEX = struct.Struct("<Q")
+_WRITE_INDEX_OFFSET = 16
+DEFAULT_CAPACITY = 4096
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Meno segmentu (krátke - macOS povolí max. 31 znakov) ----////
+def channel_name(module_name, name):
+    digest = hashlib.sha1(f"{module_name}.{name}".encode("utf-8")).hexdigest()[:20]
+    return f"jm_{digest}"
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Pripojenie bez prevzatia segmentu resource_trackerom ----////
+def _attach(shm_name):
+    # Pred Pythonom 3.13 si resource_tracker zaregistruje aj cudzí segment a pri skončení ho
+    # zmaže. Hlavný proces (vlastník) a jeho spawn workery zdieľajú jeden tracker - tam je
+    # registrácia iba duplicitná a odregistruje ju unlink vlastníka; unregister by naopak
+    # zrušil registráciu vlastníka. Iba samostatný proces má vlastný tracker a musí odregistrovať.
+    try:
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:
+        pass
+    shm = shared_memory.SharedMemory(name=shm_name)
+    if multiprocessing.parent_process() is None and not _is_provided(shm_name):
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ShmChannel ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class ShmChannel:
+    # ////---- Inicializácia ----////
+    def __init__(self, shm, owner=False):
+        self.shm = shm
+        self.owner = owner  # vlastník segment pri close() aj zmaže (unlink)
+        magic, version, self.record_size, self.capacity, _, fmt = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Segment {shm.name} nie je shm kanál (verzia {version})")
+        self.format = fmt.rstrip(b"\0").decode("ascii")
+        self._record = struct.Struct(self.format)
+        self._data = shm.buf[HEADER_SIZE:HEADER_SIZE + self.capacity * self.record_size]
+        self._write_lock = threading.Lock()  # viac vlákien jednej logiky môže zapisovať
+        self._closed = False
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Vytvorenie a pripojenie ----////
+    @classmethod
+    def create(cls, module_name, name, fmt, capacity=DEFAULT_CAPACITY):
+        record = struct.Struct(fmt)
+        if len(fmt) > 32:
+            raise ValueError("Formát záznamu môže mať max. 32 znakov")
+        shm_name = channel_name(module_name, name)
+        size = HEADER_SIZE + capacity * record.size
+        try:
+            shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+        except FileExistsError:
+            # Pozostatok po spadnutom behu - zrušíme a vytvoríme nanovo (registráciu v trackeri
+            # z pripojenia vyrovná unlink, preto bez _attach)
+            stale = shared_memory.SharedMemory(name=shm_name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=shm_name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, record.size, capacity, 0, fmt.encode("ascii"))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, module_name, name):
+        return cls(_attach(channel_name(module_name, name)))
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Zápis (jeden zapisovateľ) ----////
+    @property
+    def write_index(self):
+        return _WRITE_INDEX.unpack_from(self.shm.buf, _WRITE_INDEX_OFFSET)[0]
+
+    def write(self, *values):
+        with self._write_lock:
+            index = self.write_index
+            self._record.pack_into(self._data, (index % self.capacity) * self.record_size, *values)
+            _WRITE_INDEX.pack_into(self.shm.buf, _WRITE_INDEX_OFFSET, index + 1)
+
+    def write_many(self, data):
+        """Zapíše viac záznamov naraz (bytes/memoryview/numpy pole s rovnakým layoutom)."""
+        raw = memoryview(data).cast("B")
+        count = len(raw) // self.record_size
+        if count > self.capacity:  # do ringu sa zmestí iba posledných capacity záznamov
+            raw = raw[(count - self.capacity) * self.record_size:]
+            skipped, count = count - self.capacity, self.capacity
+        else:
+            skipped = 0
+        with self._write_lock:
+            index = self.write_index + skipped
+            start = index % self.capacity
+            first = min(count, self.capacity - start)
+            size = self.record_size
+            self._data[start * size:(start + first) * size] = raw[:first * size]
+            if first < count:
+                self._data[:(count - first) * size] = raw[first * size:count * size]
+            _WRITE_INDEX.pack_into(self.shm.buf, _WRITE_INDEX_OFFSET, index + count)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Čítanie (bez kopírovania) ----////
+    def read_since(self, cursor):
+        """Vráti (segmenty, nový_cursor, stratené). Segmenty sú 0-2 memoryview súvislých záznamov
+        v poradí zápisu. Ak čitateľ zaostal o viac než capacity, staré záznamy sa preskočia."""
+        end = self.write_index
+        lost = max(0, end - cursor - self.capacity)
+        start = cursor + lost
+        if start >= end:
+            return [], end, lost
+        size = self.record_size
+        a, b = start % self.capacity, end % self.capacity
+        if a < b:
+            segments = [self._data[a * size:b * size]]
+        else:
+            segments = [self._data[a * size:], self._data[:b * size]] if b else [self._data[a * size:]]
+        return segments, end, lost
+
+    def as_array(self):
+        """Celý ring ako numpy pole (zdieľaná pamäť, nie kópia); bez numpy memoryview.
+        Najnovší záznam je na indexe (write_index - 1) % capacity."""
+        if np is None:
+            return self._data
+        codes = self.format.lstrip("<>=!@")
+        order = {"<": "<", ">": ">", "!": ">"}.get(self.format[:1], "=")
+        if any(c.isdigit() for c in codes):
+            return self._data  # počty v formáte ("4s", "3d") - numpy view nepodporujeme
+        try:
+            if len(codes) == 1:
+                dtype = np.dtype(order + codes)
+            else:
+                # Viac polí v zázname -> štruktúrované pole f0, f1, ...
+                dtype = np.dtype([(f"f{i}", order + code) for i, code in enumerate(codes)])
+        except TypeError:
+            return self._data
+        if dtype.itemsize != self.record_size:
+            return self._data  # natívne zarovnanie s paddingom - view by nesedel
+        return np.frombuffer(self._data, dtype=dtype, count=self.capacity)
+
+    def latest(self, count):
+        """Posledných count záznamov ako list tuple (kópia, pohodlné pre malé počty)."""
+        segments, _, _ = self.read_since(max(0, self.write_index - count))
+        return [values for segment in segments for values in self._record.iter_unpack(segment)]
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Uvoľnenie ----////
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._data.release()
+            self.shm.close()
+        except BufferError:
+            # Čitateľ ešte drží view (napr. numpy pole) - mapovanie zanikne s procesom
+            print(f"[shm_channel] Kanál {self.shm.name} má ešte živé view, nechávam ho namapovaný")
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Kanály poskytované loaderom ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+_provided = {}  # (modul, meno) -> ShmChannel (vlastník) v hlavnom procese
+_opened = weakref.WeakSet()  # pripojenia vrátené z open_channel (zavrú sa pri ukončení)
+_lock = threading.Lock()
+
+def _is_provided(shm_name):
+    # Segment vytvoril tento proces (loader) - tracker je jeho vlastný
+    with _lock:
+        return any(channel.shm.name == shm_name for channel in _provided.values())
+
+# ////---- Vytvorenie kanálov z manifestu (hlavný proces, pred štartom logiky) ----////
+def provide_module_channels(module_name, channels):
+    for name, spec in (channels or {}).items():
+        key = (module_name, name)
+        with _lock:
+            if key in _provided:
+                continue  # pri reštarte logiky kanál ostáva, čitatelia sa nemusia znova pripájať
+            try:
+                _provided[key] = ShmChannel.create(module_name, name, spec.get("format", "<d"),
+                                                   int(spec.get("capacity", DEFAULT_CAPACITY)))
+            except (OSError, ValueError, struct.error, AttributeError) as e:
+                print(f"[shm_channel] Kanál {module_name}.{name} sa nepodarilo vytvoriť: {e}")
+
+# ////---- Otvorenie kanála menom (logika aj GUI) ----////
+def open_channel(module_name, name):
+    # Nikdy nevracia inštanciu vlastníka - close() čitateľa by segment zrušil (unlink)
+    # a uvoľnil pamäť, do ktorej logika ešte zapisuje
+    channel = ShmChannel.attach(module_name, name)
+    with _lock:
+        _opened.add(channel)
+    return channel
+
+# ////---- Uvoľnenie všetkých kanálov (ukončenie aplikácie) ----////
+def release_all_channels():
+    with _lock:
+        channels = list(_opened) + list(_provided.values())
+        _opened.clear()
+        _provided.clear()
+    for channel in channels:
+        channel.close()
+
+atexit.register(release_all_channels)  # worker proces logiky nemá stop_all_logics
+# ////-----------------------------------------------------------------------------------------
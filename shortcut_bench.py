@@ -0,0 +1,174 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Shortcut Bench - priepustnosť a latencia cesty skratiek bez klávesnice ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Beží headless (QCoreApplication, bez pynput a bez displeja), vhodné aj pre CI na Linuxe:
+#
+#   python shortcut_bench.py --bindings=200 --listeners=5 --events=20000 [--plain] [--json=out.json]
+#
+# --bindings   počet registrovaných "shortcut.*" bindingov
+# --listeners  počet odberateľov každého bindingu (QObject -> doručenie cez GUI frontu)
+# --plain      odberatelia sú obyčajné funkcie (synchrónne volanie v consumer threade)
+# --rate       udalostí za sekundu (bez neho sa podávajú čo najrýchlejšie = meria sa priepustnosť,
+#              s ním sa meria latencia bez umelej fronty pred consumerom)
+# --replay     namiesto generovaného prúdu prehrá nahrávku (shortcut_replay.load_recording)
+
+import sys
+import json
+import random
+import threading
+import itertools
+import time
+
+from PySide6.QtCore import QObject, QCoreApplication, Qt, Signal
+
+import shortcut_manager
+import shortcut_replay
+from latency_stats import get_latency_tracker, STAGE_HOOK_TO_EMIT, STAGE_CALLBACK, STAGE_TOTAL
+
+# ////---- Konštanty ----////
+_MOD_SETS = ["ctrl", "alt", "ctrl+alt", "ctrl+shift", "alt+shift", "ctrl+alt+shift"]
+_KEYS = [chr(c) for c in range(ord("a"), ord("z") + 1)] + [str(d) for d in range(10)] + [f"f{i}" for i in range(1, 25)]
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Parametre z príkazového riadku (--meno=hodnota) ----////
+def _option(name, default=None):
+    prefix = f"--{name}="
+    for arg in sys.argv[1:]:
+        if arg.startswith(prefix):
+            return arg[len(prefix):]
+        if arg == f"--{name}":
+            return True
+    return default
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Odberateľ - QObject, aby išiel cez frontu GUI threadu ako skutočné widgety ----////
+class _Receiver(QObject):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def on_shortcut(self):
+        self.calls += 1
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Signál konca behu - ukončí event loop hlavného vlákna ----////
+class _Done(QObject):
+    finished = Signal()
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Generovanie bindingov a prúdu ----////
+def make_bindings(count):
+    combos = (f"{mods}+{key}" for mods, key in itertools.product(_MOD_SETS, _KEYS))
+    singles = list(itertools.islice(combos, count))
+    # Viac bindingov, než je jednokrokových kombinácií -> dvojkrokové sekvencie
+    pairs = (f"{a} {b}" for a, b in itertools.product(singles, repeat=2) if a != b)
+    return singles + list(itertools.islice(pairs, max(0, count - len(singles))))
+
+def make_stream(bindings, hits, rate=None, seed=1):
+    rng = random.Random(seed)
+    events = []
+    for _ in range(hits):
+        events.extend(shortcut_replay.sequence_events(rng.choice(bindings)))
+    if rate:
+        events = [(kind, key, i / rate) for i, (kind, key, _) in enumerate(events)]
+    return events
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Beh benchmarku ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def run(bindings=100, listeners=1, events=10000, plain=False, recording=None, rate=None):
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+    bridge = shortcut_manager.get_bridge()
+    tracker = get_latency_tracker()
+    tracker.reset()
+
+    names = make_bindings(bindings)
+    receivers, counter, subscriptions = [], [0], []
+    for _ in range(listeners):
+        if plain:
+            def callback():
+                counter[0] += 1
+        else:
+            receiver = _Receiver()
+            receivers.append(receiver)
+            callback = receiver.on_shortcut
+        for name in names:
+            subscriptions.append(bridge.on(f"{shortcut_manager.SHORTCUT_PREFIX}{name}", callback))
+
+    if recording:
+        stream = shortcut_replay.load_recording(recording)
+        hits = None
+    else:
+        hits = max(1, events // 4)  # jednokrokové combo = min. 4 udalosti (2x press, 2x release)
+        stream = make_stream(names, hits, rate)
+
+    listener = shortcut_manager.ShortcutListener(hook=False, verbose=False)
+    feeder = threading.Thread(target=shortcut_replay.replay, args=(listener, stream, bool(rate or recording)),
+                              daemon=True)
+
+    # Hlavné vlákno = GUI thread: skutočný event loop vybavuje frontu QtBridge (žiadny busy
+    # loop, ktorý by bral jadro meranému consumer vláknu). Koniec hlási pomocné vlákno.
+    done = _Done()
+    done.finished.connect(app.quit, Qt.QueuedConnection)
+
+    def watch():
+        feeder.join()
+        while not listener.wait_idle(1.0):
+            pass
+        done.finished.emit()  # queued - quit príde až po dávkach, ktoré consumer poslal skôr
+
+    start = time.perf_counter()
+    feeder.start()
+    threading.Thread(target=watch, name="bench-watch", daemon=True).start()
+    app.exec()
+    app.processEvents()
+    elapsed = time.perf_counter() - start
+    listener.stop()
+
+    delivered = counter[0] + sum(r.calls for r in receivers)
+    result = {
+        "bindings": len(names),
+        "listeners": listeners,
+        "mode": "plain" if plain else "qobject",
+        "events": len(stream),
+        "hits": hits,
+        "delivered": delivered,
+        "seconds": elapsed,
+        "events_per_sec": len(stream) / elapsed if elapsed else None,
+        "rate": rate,
+        "dropped": listener._ring.dropped,
+        "latency": {stage: tracker.merged(stage).summary()
+                    for stage in (STAGE_HOOK_TO_EMIT, STAGE_CALLBACK, STAGE_TOTAL)},
+    }
+    for subscription in subscriptions:
+        subscription.cancel()
+    return result
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Výpis ----////
+def print_result(result):
+    print(f"[shortcut_bench] {result['events']} udalostí, {result['bindings']} bindingov, "
+          f"{result['listeners']} odberateľov ({result['mode']})")
+    print(f"[shortcut_bench] {result['events_per_sec']:.0f} udalostí/s, doručených callbackov: {result['delivered']}")
+    for stage, data in result["latency"].items():
+        if data["count"]:
+            print(f"[shortcut_bench]   {stage:<10} p50 {data['p50_us']} us  p99 {data['p99_us']} us  max {data['max_us']} us")
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Spustenie z príkazového riadku ----////
+if __name__ == "__main__":
+    result = run(
+        bindings=int(_option("bindings", 100)),
+        listeners=int(_option("listeners", 1)),
+        events=int(_option("events", 10000)),
+        plain=bool(_option("plain", False)),
+        recording=_option("replay"),
+        rate=float(_option("rate", 0)) or None,
+    )
+    print_result(result)
+    json_path = _option("json")
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+# ////-----------------------------------------------------------------------------------------
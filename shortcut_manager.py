@@ -1,6 +1,7 @@
 # shortcut_manager.py
 # Widget: Skratky a ich spracovanie cez QtBridge (thread-safe)
-# Používa pynput na globálne zachytávanie klávesových skratiek
+# Používa pynput na globálne zachytávanie klávesových skratiek (import až pri štarte hooku,
+# bez hooku sa dajú udalosti podávať cez inject() - pozri shortcut_replay.py)
 # Autor: Jastronit
 # Verzia: 3.0
 
@@ -9,99 +10,504 @@
 # /////////////////////////////////////////////////////////////////////////////////////////////
 
 # ////---- Importy ----////
-from PySide6.QtCore import QObject, QMetaObject, Qt, QTimer
-from pynput import keyboard
-import threading, weakref, time, traceback
+from PySide6.QtCore import QObject, QCoreApplication, QMetaObject, Qt, QTimer, Signal
+from collections import deque
+import threading, weakref, time, traceback, itertools
+
+from latency_stats import get_latency_tracker, STAGE_HOOK_TO_EMIT
+from data_bus import get_data_bus, MODE_LATEST
 # ////-----------------------------------------------------------------------------------------
 
 # ////---- Konštanty ----////
 MODIFIERS = ["ctrl", "alt", "shift"]
 DEAD_KEYS = {"ˇ", "´", "`", "^", "˚", "¨", "¸", "~"}
 INVALID_CHARS = {"?", "_", "ˇ"}
+SHORTCUT_PREFIX = "shortcut."
+SEQUENCE_TIMEOUT = 1.0  # max. sekúnd medzi krokmi sekvencie (napr. "ctrl+k ctrl+s")
+DEFAULT_REFRESH_RATE = 60.0  # Hz, ak obrazovka nie je dostupná (QCoreApplication, headless)
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Kódy kláves a combo ID ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Každý názov klávesu dostane pri prvom výskyte celé číslo (interning). Modifikátory majú
+# pevné najnižšie bity, ostatné klávesy bit (1 << kód) posunutý o MOD_BITS. Combo ID je
+# OR bitov stlačených kláves = (stlačené << MOD_BITS) | maska modifikátorov, takže
+# "ctrl+f9" a "f9+ctrl" je to isté číslo a stlačenie/uvoľnenie sú iba bitové operácie.
+
+# ////---- Modifikátory ----////
+MOD_BITS = len(MODIFIERS)
+MODIFIER_MASKS = {name: 1 << i for i, name in enumerate(MODIFIERS)}  # ctrl=1, alt=2, shift=4
+MOD_MASK_ALL = (1 << MOD_BITS) - 1
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Tabuľka kódov ----////
+_key_codes = {}   # názov -> kód
+_key_names = []   # kód -> názov
+_fkey_bits = 0    # OR bitov kláves F1-F24
+_key_table_lock = threading.Lock()
+
+def key_code(name):
+    """Vráti celočíselný kód klávesu (pri prvom výskyte ho pridelí)."""
+    global _fkey_bits
+    code = _key_codes.get(name)
+    if code is None:
+        with _key_table_lock:
+            code = _key_codes.get(name)
+            if code is None:
+                code = len(_key_names)
+                _key_names.append(name)
+                _key_codes[name] = code
+                if name.startswith("f") and name[1:].isdigit() and 1 <= int(name[1:]) <= 24:
+                    _fkey_bits |= 1 << (code + MOD_BITS)
+    return code
+
+def key_bit(name):
+    """Bit klávesu v combo ID (modifikátor = maska, ostatné = posunutý kód)."""
+    mask = MODIFIER_MASKS.get(name)
+    if mask is not None:
+        return mask
+    return 1 << (key_code(name) + MOD_BITS)
+
+def is_fkey_bit(bit):
+    return bool(_fkey_bits & bit)
+
+def combo_id(text):
+    """Text comba -> celé číslo ("ctrl+f9" aj "f9+ctrl" dajú rovnaké ID)."""
+    cid = 0
+    for name in text.lower().split("+"):
+        name = name.strip()
+        if name:
+            cid |= key_bit(name)
+    return cid
+
+def combo_name(cid):
+    """Kanonický textový tvar combo ID (modifikátory prvé, potom klávesy podľa kódu)."""
+    names = [name for name, mask in MODIFIER_MASKS.items() if cid & mask]
+    keys, code = cid >> MOD_BITS, 0
+    while keys:
+        if keys & 1:
+            names.append(_key_names[code])
+        keys >>= 1
+        code += 1
+    return "+".join(names)
 # ////-----------------------------------------------------------------------------------------
 
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- QtBridge - thread-safe event bus pre shortcuty ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
 
+# ////---- Handle registrácie - O(1) odregistrovanie ----////
+class Subscription:
+    __slots__ = ("bridge", "event", "token")
+
+    def __init__(self, bridge, event, token):
+        self.bridge = bridge
+        self.event = event
+        self.token = token
+
+    def cancel(self):
+        self.bridge._remove(self.event, self.token)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Slabá referencia na callback ----////
+def _make_ref(callback):
+    # Bound metóda -> WeakMethod (widget/overlay nedrží pri živote iba bridge),
+    # obyčajná funkcia/lambda -> silná referencia (inak by hneď zanikla)
+    if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+        return weakref.WeakMethod(callback)
+    return lambda: callback
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Signály bridge (samostatný QObject) ----////
+# QtBridge má verejnú metódu emit(event_name, ...) - PySide6 <= 6.8 by ňou Signal.emit
+# signálov definovaných priamo na bridge prekryl a nič by sa nedoručilo
+class _BridgeSignals(QObject):
+    dispatch_requested = Signal()  # jeden queued signál na dávku, nie QTimer na každý callback
+    data_ready = Signal()  # data_bus má nové dáta - naplánuje doručenie na najbližšiu snímku
+# ////-----------------------------------------------------------------------------------------
+
 # ////---- QtBridge ----////
 class QtBridge(QObject):
     _instance = None
+    _instance_lock = threading.Lock()
 
     # ////---- Inicializácia ----////
     def __init__(self):
         super().__init__()
-        self._listeners = {}  # dict: event_name -> [callback1, callback2,...]
+        self._listeners = {}  # dict: event_name -> {token: (ref, gui)}; ref() vráti callback alebo None
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        self.shortcut_version = 0  # zvýši sa pri každej zmene "shortcut.*" bindingov
+
+        # Fronta callbackov pre GUI thread - vybaví sa raz za iteráciu event loopu
+        self._pending = deque()  # (event_name, token, ref, args, kwargs, t_hook, t_emit)
+        self._pending_lock = threading.Lock()
+        self._dispatch_scheduled = False
+        self._coalesce = set()  # eventy, pri ktorých sa duplicity v jednej dávke zlúčia
+        self._signals = _BridgeSignals(self)  # potomok - moveToThread ho presunie spolu s bridge
+        self._signals.dispatch_requested.connect(self._drain, Qt.QueuedConnection)
+        self.latency = get_latency_tracker()  # hook -> emit -> štart callbacku -> koniec
+
+        # Témy z logiky (data_bus) - doručenie zlúčené na frekvenciu obrazovky
+        self.data_bus = get_data_bus()
+        self._frame_ms = 1000.0 / self._refresh_rate()
+        self._last_data_drain = 0.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._drain_data)
+        self._signals.data_ready.connect(self._schedule_data_drain, Qt.QueuedConnection)
+        self.data_bus.set_notifier(self._signals.data_ready.emit)
+    # ////-------------------------------------------------------------------------------------
+
+    @staticmethod
+    def _refresh_rate():
+        try:
+            from PySide6.QtGui import QGuiApplication
+            screen = QGuiApplication.primaryScreen() if isinstance(QGuiApplication.instance(), QGuiApplication) else None
+            if screen is not None and screen.refreshRate() > 0:
+                return screen.refreshRate()
+        except ImportError:
+            pass
+        return DEFAULT_REFRESH_RATE
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Singleton inštancia ----////
     @classmethod
     def instance(cls):
-        if cls._instance is None:
-            cls._instance = cls()
-        return cls._instance
+        # _drain a frame timer bežia vo vlákne, ktorému bridge patrí - musí to byť vlákno
+        # QApplication s event loopom, nie vlákno logiky alebo consumer skratiek
+        with cls._instance_lock:
+            if cls._instance is None:
+                app = QCoreApplication.instance()
+                if app is None and threading.current_thread() is not threading.main_thread():
+                    raise RuntimeError("QtBridge sa musí vytvoriť v GUI threade (alebo po vytvorení QApplication)")
+                bridge = cls()
+                if app is not None:
+                    bridge.moveToThread(app.thread())  # presunie aj frame timer (potomok); v GUI threade no-op
+                cls._instance = bridge
+            return cls._instance
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Eventy ----////
-    def on(self, event, callback):
-        """Registruje callback pre danú skratku"""
-        self._listeners.setdefault(event, []).append(callback)
-
-    def off(self, event, callback):
-        """Odregistruje callback"""
-        if event in self._listeners:
-            self._listeners[event] = [c for c in self._listeners[event] if c != callback]
-            if not self._listeners[event]:
+    def on(self, event, callback, coalesce=False):
+        """Registruje callback pre danú skratku (aj sekvenciu: "shortcut.ctrl+k ctrl+s").
+        coalesce=True: viac rovnakých eventov v jednej dávke sa doručí iba raz (posledný).
+        Vráti Subscription - jeho cancel() odregistruje callback v O(1)."""
+        owner = getattr(callback, "__self__", None)
+        gui = isinstance(owner, QObject)
+        with self._lock:
+            token = next(self._tokens)
+            if event.startswith(SHORTCUT_PREFIX) and event not in self._listeners:
+                self.shortcut_version += 1
+            self._listeners.setdefault(event, {})[token] = (_make_ref(callback), gui)
+            if coalesce:
+                self._coalesce.add(event)
+        if gui:
+            # Zničený widget sa odregistruje sám, aj keď nikdy nezavolá off()
+            owner.destroyed.connect(lambda *_, event=event, token=token: self._remove(event, token))
+        return Subscription(self, event, token)
+
+    def off(self, event, callback=None):
+        """Odregistruje callback (alebo Subscription vrátený z on())"""
+        if isinstance(event, Subscription):
+            return event.cancel()
+        with self._lock:
+            tokens = [t for t, (ref, _) in self._listeners.get(event, {}).items() if ref() == callback]
+        for token in tokens:
+            self._remove(event, token)
+
+    def _remove(self, event, token):
+        with self._lock:
+            callbacks = self._listeners.get(event)
+            if not callbacks or callbacks.pop(token, None) is None:
+                return
+            if not callbacks:
                 del self._listeners[event]
+                self._coalesce.discard(event)
+                if event.startswith(SHORTCUT_PREFIX):
+                    self.shortcut_version += 1
+
+    def shortcut_events(self):
+        """Vráti (verzia, zoznam registrovaných "shortcut.*" eventov)"""
+        with self._lock:
+            return self.shortcut_version, [e for e in self._listeners if e.startswith(SHORTCUT_PREFIX)]
 
     def emit(self, event_name, *args, **kwargs):
-        if event_name not in self._listeners:
-            return
+        self.emit_at(None, event_name, *args, **kwargs)
 
-        for cb in list(self._listeners[event_name]):
+    def emit_at(self, t_hook, event_name, *args, **kwargs):
+        """Ako emit, t_hook je perf_counter() z pynput callbacku (pre meranie latencie)."""
+        callbacks = self._listeners.get(event_name)
+        if not callbacks:
+            return
+        t_emit = time.perf_counter()
+        if t_hook is not None:
+            self.latency.record(event_name, STAGE_HOOK_TO_EMIT, t_emit - t_hook)
+
+        schedule = False
+        dead = []
+        for token, (ref, gui) in list(callbacks.items()):
+            if gui:
+                # Thread-safe volanie v hlavnom GUI threade - iba zaradenie do fronty
+                with self._pending_lock:
+                    self._pending.append((event_name, token, ref, args, kwargs, t_hook, t_emit))
+                    if not self._dispatch_scheduled:
+                        self._dispatch_scheduled = schedule = True
+                continue
+            # obyčajná funkcia, nie Qt objekt
+            cb = ref()
+            if cb is None:
+                dead.append(token)
+                continue
+            t_start = time.perf_counter()
             try:
-                if hasattr(cb, "__self__") and isinstance(cb.__self__, QObject):
-                    # Thread-safe volanie v hlavnom GUI threade
-                    QTimer.singleShot(0, lambda cb=cb: cb(*args, **kwargs))
-                else:
-                    # obyčajná funkcia, nie Qt objekt
-                    cb(*args, **kwargs)
+                cb(*args, **kwargs)
             except Exception as e:
                 print(f"[Bridge] Error calling {cb}: {e}")
+            self.latency.record_dispatch(event_name, t_hook, t_emit, t_start, time.perf_counter())
+
+        for token in dead:
+            self._remove(event_name, token)
+        # Jeden queued signál prebudí GUI thread pre celú dávku
+        if schedule:
+            self._signals.dispatch_requested.emit()
+
+    def _drain(self):
+        # Beží v GUI threade: vybaví všetko, čo sa nazbieralo od posledného prebudenia
+        with self._pending_lock:
+            batch, self._pending = self._pending, deque()
+            self._dispatch_scheduled = False
+
+        # Zlúčenie duplicít: pre coalesce eventy ostane iba posledný výskyt (event, callback)
+        last_index = {}
+        if self._coalesce:
+            for i, (event_name, token, *_) in enumerate(batch):
+                if event_name in self._coalesce:
+                    last_index[(event_name, token)] = i
+
+        for i, (event_name, token, ref, args, kwargs, t_hook, t_emit) in enumerate(batch):
+            if last_index.get((event_name, token), i) != i:
+                continue
+            cb = ref()
+            if cb is None:
+                self._remove(event_name, token)  # objekt medzitým zanikol
+                continue
+            t_start = time.perf_counter()
+            try:
+                cb(*args, **kwargs)
+            except Exception as e:
+                print(f"[Bridge] Error calling {cb}: {e}")
+            self.latency.record_dispatch(event_name, t_hook, t_emit, t_start, time.perf_counter())
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Témy dát z logiky (publish/subscribe cez data_bus) ----////
+    def publish(self, topic, value):
+        """Publikuje hodnotu témy (bezpečné z ľubovoľného vlákna)."""
+        self.data_bus.publish(topic, value)
+
+    def subscribe(self, topic, callback, mode=MODE_LATEST, maxlen=None):
+        """Callback beží v GUI threade najviac raz za snímku: latest -> hodnota, queue -> list hodnôt.
+        Vráti DataSubscription (cancel()), QObject odberateľ sa odhlási sám pri zničení."""
+        subscription = self.data_bus.subscribe(topic, callback, mode, maxlen)
+        owner = getattr(callback, "__self__", None)
+        if isinstance(owner, QObject):
+            owner.destroyed.connect(lambda *_, sub=subscription: sub.cancel())
+        return subscription
+
+    def _schedule_data_drain(self):
+        # Prvé dáta po pauze idú hneď, ďalšie najskôr o snímku neskôr (zlúčenie)
+        if self._frame_timer.isActive():
+            return
+        elapsed_ms = (time.perf_counter() - self._last_data_drain) * 1000.0
+        self._frame_timer.start(int(max(0.0, self._frame_ms - elapsed_ms)))
+
+    def _drain_data(self):
+        self._last_data_drain = time.perf_counter()
+        self.data_bus.drain()
     # ////-------------------------------------------------------------------------------------
 
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- ShortcutTrie - skompilované bindingy (aj viackrokové sekvencie) ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Binding "shortcut.ctrl+k ctrl+s" = dva kroky. Každý kláves posunie ukazovateľ stavu
+# o jeden uzol (jeden dict lookup), cena nezávisí od počtu registrovaných bindingov.
+
+# ////---- Uzol trie ----////
+class _TrieNode:
+    __slots__ = ("children", "events")
+
+    def __init__(self):
+        self.children = {}  # combo ID (int) -> _TrieNode
+        self.events = []    # eventy, ktoré sa emitnú po dosiahnutí tohto uzla
+
+# ////---- Trie + stavový automat ----////
+class ShortcutTrie:
+    def __init__(self, events=(), timeout=SEQUENCE_TIMEOUT):
+        self.root = _TrieNode()
+        self.timeout = timeout
+        self._state = self.root
+        self._last_step = 0.0
+        for event in events:
+            self.add(event)
+
+    @staticmethod
+    def parse_steps(event):
+        # "shortcut.ctrl+k ctrl+s" -> [combo_id("ctrl+k"), combo_id("ctrl+s")]
+        return [combo_id(step) for step in event[len(SHORTCUT_PREFIX):].split()]
+
+    def add(self, event):
+        steps = self.parse_steps(event)
+        if not steps:
+            return
+        node = self.root
+        for step in steps:
+            node = node.children.setdefault(step, _TrieNode())
+        node.events.append(event)
+
+    def reset(self):
+        self._state = self.root
+
+    def is_pending(self, now=None):
+        """Rozbehnutá sekvencia čaká na ďalší krok (a ešte nevypršala)."""
+        if self._state is self.root:
+            return False
+        now = time.monotonic() if now is None else now
+        return now - self._last_step <= self.timeout
+
+    def feed(self, combo, now=None):
+        """Posunie automat o jedno combo ID, vráti zoznam eventov na emit (často prázdny)."""
+        now = time.monotonic() if now is None else now
+        if self._state is not self.root and now - self._last_step > self.timeout:
+            self._state = self.root  # sekvencia vypršala
+
+        node = self._state.children.get(combo)
+        if node is None and not combo >> MOD_BITS:
+            return ()  # samotné modifikátory (ctrl medzi krokmi) rozbehnutú sekvenciu nerušia
+        if node is None and self._state is not self.root:
+            # Nepokračuje rozbehnutú sekvenciu - môže začínať novú
+            node = self.root.children.get(combo)
+        if node is None:
+            self._state = self.root
+            return ()
+
+        self._last_step = now
+        # Uzol s potomkami čaká na ďalší krok (jeho vlastné eventy sa emitnú hneď)
+        self._state = node if node.children else self.root
+        return node.events
+# ////-----------------------------------------------------------------------------------------
+
 # ////---- Získanie globálnej inštancie QtBridge ----////
 def get_bridge():
     return QtBridge.instance()
 # ////-----------------------------------------------------------------------------------------
 
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- KeyEventRing - predalokovaný ring buffer medzi OS hookom a consumer threadom ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Jeden zapisovateľ (pynput hook) a jeden čitateľ (consumer thread). Každý index mení iba
+# jedna strana a zápis do slotu listu je pod GIL atomický, takže push nepotrebuje zámok.
+# Pri plnom bufferi sa udalosť zahodí - hook nesmie nikdy čakať.
+
+# ////---- Druhy udalostí ----////
+KEY_PRESS = 0
+KEY_RELEASE = 1
+RING_CAPACITY = 1024  # mocnina dvoch - index sa počíta maskou
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Ring buffer ----////
+class KeyEventRing:
+    def __init__(self, capacity=RING_CAPACITY):
+        if capacity & (capacity - 1):
+            raise ValueError("capacity musí byť mocnina dvoch")
+        self._slots = [None] * capacity
+        self._mask = capacity - 1
+        self._capacity = capacity
+        self._write = 0  # mení iba producent
+        self._read = 0   # mení iba konzument
+        self.dropped = 0
+
+    def push(self, kind, key, timestamp):
+        w = self._write
+        if w - self._read >= self._capacity:
+            self.dropped += 1
+            return False
+        self._slots[w & self._mask] = (kind, key, timestamp)
+        self._write = w + 1  # publikovanie až po zápise slotu
+        return True
+
+    def is_full(self):
+        return self._write - self._read >= self._capacity
+
+    @property
+    def pushed(self):
+        """Celkový počet vložených udalostí"""
+        return self._write
+
+    def drain(self):
+        """Vráti všetky čakajúce udalosti v poradí (volá iba konzument)."""
+        r, w = self._read, self._write
+        if r == w:
+            return ()
+        mask, slots = self._mask, self._slots
+        events = [slots[i & mask] for i in range(r, w)]
+        for i in range(r, w):
+            slots[i & mask] = None
+        self._read = w
+        return events
+
+    def __len__(self):
+        return self._write - self._read
+# ////-----------------------------------------------------------------------------------------
+
 # /////////////////////////////////////////////////////////////////////////////////////////////
 # ////---- ShortcutListener ----////
 # /////////////////////////////////////////////////////////////////////////////////////////////
+# OS hook (pynput) iba označí udalosť časom a vloží ju do ringu. Normalizáciu, skladanie
+# comba, trie, výpis aj emit robí consumer thread - pomalý callback tak nezdrží systémový vstup.
+
+# ////---- Konštanty ----////
+STUCK_KEY_TIMEOUT = 10.0  # sekúnd bez udalosti -> stlačené klávesy považujeme za zaseknuté
+RESTART_BACKOFF_MAX = 5.0  # max. pauza pred reštartom hooku, ktorý opakovane hneď padá
+# ////-----------------------------------------------------------------------------------------
 
 # ////---- ShortcutListener trieda ----////
 class ShortcutListener:
     # ////---- Inicializácia ----////
-    def __init__(self):
+    def __init__(self, hook=True, verbose=True):
+        """hook=False: bez pynput, udalosti prichádzajú iba cez inject() (replay, benchmark)."""
         print(f"[ShortcutListener] Inicializácia listenera (id: {id(self)})")
+        self.verbose = verbose
+        self.recording = None  # list -> consumer doň zapisuje (druh, názov klávesu, čas)
+        self._processed = 0  # počet spracovaných udalostí z ringu
 
-        self._objects = []  # weakref objekty
+        self._objects = []  # weakref objekty s metódou handle_shortcut(combo)
         self._lock = threading.Lock()
-        self._pressed_keys = []
-        self._last_sent = None
-        self._last_event_time = time.time()
+        self._pressed = 0  # combo ID stlačených kláves (patrí iba consumer threadu)
+        self._last_sent = 0
+        self._key_cache = {}  # pynput key -> bit (0 = ignorovaný kláves)
+        self._last_event_time = time.perf_counter()
         self._stop_event = threading.Event()
 
         self.bridge = get_bridge()  # použitie QtBridge
-
-        self.listener = self._create_listener()
-        self.listener.start()
-
-        threading.Thread(target=self._watchdog_loop, daemon=True).start()
+        self._trie = ShortcutTrie()
+        self._trie_version = -1  # verzia bindingov, z ktorej je trie skompilovaná
+
+        self._ring = KeyEventRing()
+        self._wakeup = threading.Event()
+        self._consumer = threading.Thread(target=self._consumer_loop, name="shortcut-consumer", daemon=True)
+        self._consumer.start()
+
+        self.listener = None
+        if hook:
+            self.listener = self._create_listener()
+            self.listener.start()
+            threading.Thread(target=self._supervisor_loop, name="shortcut-supervisor", daemon=True).start()
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Vytváranie listenera a normalizácia kláves ----////
     def _create_listener(self):
+        from pynput import keyboard  # lazy - headless/CI beh bez hooku pynput nepotrebuje
         listener = keyboard.Listener(
             on_press=self._on_press,
             on_release=self._on_release
@@ -123,109 +529,190 @@ class ShortcutListener:
             return k
         except Exception:
             return None
-    # ////-------------------------------------------------------------------------------------
 
-    # ////---- Kompozícia skratky ----////
-    def _compose_combo(self):
-        if not self._pressed_keys:
-            return None
-        combo = []
-        seen = set()
-        for k in self._pressed_keys:
-            if k not in seen:
-                combo.append(k)
-                seen.add(k)
-        return "+".join(combo)
+    def _key_bit(self, key):
+        # Normalizácia textu iba pri prvom výskyte daného klávesu, potom jeden dict lookup
+        try:
+            return self._key_cache[key]
+        except KeyError:
+            pass
+        except TypeError:
+            name = self._normalize_key(key)  # nehashovateľný kláves - bez cache
+            return key_bit(name) if name else 0
+        name = self._normalize_key(key)
+        bit = key_bit(name) if name else 0
+        self._key_cache[key] = bit
+        return bit
     # ////-------------------------------------------------------------------------------------
 
-    # ////---- Registrácia a odregistrácia objektov ----////
-    # Poznámka: Toto je staré spracovanie, nahradené QtBridge
-    """def register_object(self, obj):
+    # ////---- Registrácia a odregistrácia objektov (API zo shortcut_listener.py) ----////
+    def register_object(self, obj):
         with self._lock:
             self._objects.append(weakref.ref(obj))
 
     def unregister_object(self, obj):
         with self._lock:
-            self._objects = [ref for ref in self._objects if ref() is not obj]"""
+            self._objects = [ref for ref in self._objects if ref() is not obj]
     # ////-------------------------------------------------------------------------------------
 
-    # ////---- Eventy stlačenia a uvoľnenia kláves ----////
+    # ////---- OS hook - iba časová značka (perf_counter) a zápis do ringu ----////
     def _on_press(self, key):
-        k = self._normalize_key(key)
-        if not k or k in self._pressed_keys:
+        if self._ring.push(KEY_PRESS, key, time.perf_counter()):
+            self._wakeup.set()
+
+    def _on_release(self, key):
+        if self._ring.push(KEY_RELEASE, key, time.perf_counter()):
+            self._wakeup.set()
+
+    def inject(self, kind, key, timestamp=None):
+        """Vloží udalosť rovnakou cestou ako OS hook. Pri plnom bufferi počká (nezahadzuje)."""
+        timestamp = time.perf_counter() if timestamp is None else timestamp
+        while self._ring.is_full():
+            self._wakeup.set()
+            time.sleep(0.0005)
+        self._ring.push(kind, key, timestamp)
+        self._wakeup.set()
+
+    def wait_idle(self, timeout=5.0):
+        """Počká, kým consumer spracuje všetky vložené udalosti. Vráti False pri timeoute."""
+        deadline = time.perf_counter() + timeout
+        while self._processed < self._ring.pushed:
+            if time.perf_counter() > deadline:
+                return False
+            time.sleep(0.0005)
+        return True
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Consumer thread - spracovanie udalostí mimo hooku ----////
+    def _consumer_loop(self):
+        while not self._stop_event.is_set():
+            # Bez stlačených kláves spí bez timeoutu (nulové idle prebúdzanie),
+            # inak presne do termínu zaseknutých kláves
+            timeout = None
+            if self._pressed:
+                timeout = max(0.0, self._last_event_time + STUCK_KEY_TIMEOUT - time.perf_counter())
+            self._wakeup.wait(timeout)
+            self._wakeup.clear()
+            for kind, key, timestamp in self._ring.drain():
+                try:
+                    if kind == KEY_PRESS:
+                        self._handle_press(key, timestamp)
+                    else:
+                        self._handle_release(key, timestamp)
+                except Exception:
+                    traceback.print_exc()
+                if self.recording is not None:
+                    self.recording.append((kind, self._normalize_key(key), timestamp))
+                self._processed += 1
+            self._reset_stuck_keys()
+
+    def _handle_press(self, key, timestamp):
+        bit = self._key_bit(key)
+        if not bit or self._pressed & bit:
             return
 
-        self._pressed_keys.append(k)
-        self._last_event_time = time.time()
+        self._pressed |= bit
+        self._last_event_time = timestamp
 
-        is_fkey = k.startswith("f") and k[1:].isdigit() and 1 <= int(k[1:]) <= 24
-        if not any(mod in self._pressed_keys for mod in MODIFIERS) and not is_fkey:
+        if not self._pressed & MOD_MASK_ALL and not is_fkey_bit(bit):
+            # Samotný kláves je iba ďalší krok rozbehnutej sekvencie ("ctrl+k s")
+            if self._trie.is_pending():
+                self._last_sent = self._pressed
+                for event in self._match(self._pressed):
+                    self.bridge.emit_at(timestamp, event)
             return
 
-        combo = self._compose_combo()
-        if not combo or combo == self._last_sent:
+        combo = self._pressed
+        if combo == self._last_sent:
             return
         self._last_sent = combo
 
-        print(f"[ShortcutListener] Shortcut: {combo} (id: {id(self)})")
+        if self.verbose:
+            print(f"[ShortcutListener] Shortcut: {combo_name(combo)} (id: {id(self)})")
 
-        # ----- Staré spracovanie registrovaných objektov -----
-        """
-        with self._lock:
-            alive_refs = []
-            for ref in self._objects:
-                obj = ref()
-                if obj is None:
-                    continue
-                try:
-                    if hasattr(obj, "handle_shortcut"):
-                        obj.handle_shortcut(combo)
-                    alive_refs.append(ref)
-                except ReferenceError:
-                    continue
-                except Exception:
-                    traceback.print_exc()
-                    alive_refs.append(ref)
-            self._objects = alive_refs"""
+        # ----- Objekty registrované cez register_object -----
+        if self._objects:
+            self._notify_objects(combo_name(combo))
 
         # ----- Emit shortcut cez QtBridge (thread-safe pre widgety) -----
-        self.bridge.emit(f"shortcut.{combo}")
-    # ////-------------------------------------------------------------------------------------
+        for event in self._match(combo):
+            self.bridge.emit_at(timestamp, event)
 
-    # ////---- Event uvoľnenia kláves ----////
-    def _on_release(self, key):
-        k = self._normalize_key(key)
-        if not k:
+    def _handle_release(self, key, timestamp):
+        bit = self._key_bit(key)
+        if not bit:
             return
-        if k in self._pressed_keys:
-            self._pressed_keys.remove(k)
-        if self._last_sent and k in self._last_sent.split("+"):
-            self._last_sent = None
-        self._last_event_time = time.time()
+        self._pressed &= ~bit
+        if self._last_sent & bit:
+            self._last_sent = 0
+        self._last_event_time = timestamp
+
+    def _notify_objects(self, combo):
+        with self._lock:
+            refs = list(self._objects)
+        dead = False
+        for ref in refs:
+            obj = ref()
+            if obj is None:
+                dead = True
+                continue
+            try:
+                obj.handle_shortcut(combo)
+            except ReferenceError:
+                dead = True
+            except Exception:
+                traceback.print_exc()
+        if dead:
+            with self._lock:
+                self._objects = [ref for ref in self._objects if ref() is not None]
+
+    def _reset_stuck_keys(self):
+        if self._pressed and time.perf_counter() - self._last_event_time >= STUCK_KEY_TIMEOUT:
+            print("[ShortcutListener] Resetujem zaseknuté klávesy…")
+            self._pressed = 0
+            self._last_sent = 0
     # ////-------------------------------------------------------------------------------------
 
-    # ////---- Watchdog loop pre reset zaseknutých kláves a reštart listenera ----////
-    def _watchdog_loop(self):
+    # ////---- Posun automatu bindingov (trie sa prekompiluje iba pri zmene bindingov) ----////
+    def _match(self, combo):
+        if self.bridge.shortcut_version != self._trie_version:
+            version, events = self.bridge.shortcut_events()
+            self._trie = ShortcutTrie(events)
+            self._trie_version = version
+        return self._trie.feed(combo)
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Dohľad nad pynput vláknom - join namiesto periodickej kontroly ----////
+    def _supervisor_loop(self):
+        backoff = 0.0
         while not self._stop_event.is_set():
-            time.sleep(3)
-            now = time.time()
-            with self._lock:
-                self._pressed_keys = [k for k in self._pressed_keys if k not in DEAD_KEYS | INVALID_CHARS]
-            if now - self._last_event_time > 10 and self._pressed_keys:
-                print("[ShortcutListener] Resetujem zaseknuté klávesy…")
-                with self._lock:
-                    self._pressed_keys.clear()
-                    self._last_sent = None
-            if not self.listener.is_alive():
-                print("[ShortcutListener] Listener padol, reštartujem…")
-                self.listener = self._create_listener()
-                self.listener.start()
+            started = time.perf_counter()
+            try:
+                self.listener.join()  # vráti sa, až keď hook skončí; pynput tu znovu vyhodí chybu z callbacku
+            except Exception as e:
+                print(f"[ShortcutListener] Listener skončil s chybou: {e}")
+            if self._stop_event.is_set():
+                break
+
+            # Hook, ktorý padá hneď po štarte, nereštartujeme v slučke naplno
+            if time.perf_counter() - started > RESTART_BACKOFF_MAX:
+                backoff = 0.0
+            else:
+                backoff = min(RESTART_BACKOFF_MAX, backoff * 2 or 0.1)
+            if backoff and self._stop_event.wait(backoff):
+                break
+            print("[ShortcutListener] Listener padol, reštartujem…")
+            self.listener = self._create_listener()
+            self.listener.start()
+            if self._stop_event.is_set():
+                self.listener.stop()  # stop() prišiel počas reštartu
     # ////-------------------------------------------------------------------------------------
 
     # ////---- Zastavenie listenera ----////
     def stop(self):
         print("[ShortcutListener] Stop volané")
         self._stop_event.set()
+        self._wakeup.set()
 
         # Bezpečné zastavenie pynput listenera
         if self.listener:
@@ -237,7 +724,10 @@ class ShortcutListener:
                     self.listener.join(timeout=1)
             except Exception as e:
                 print(f"[ShortcutListener] Chyba pri stop(): {e}")
+        self._consumer.join(timeout=1)
 
+        if self._ring.dropped:
+            print(f"[ShortcutListener] Zahodených udalostí (plný buffer): {self._ring.dropped}")
         print("[ShortcutListener] Úplne zastavený")
     # ////-------------------------------------------------------------------------------------
 
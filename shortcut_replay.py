@@ -0,0 +1,110 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Shortcut Replay - syntetické a nahrané klávesové udalosti bez OS hooku ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Udalosti idú cez ShortcutListener.inject(), teda rovnakou cestou ako z pynput callbacku
+# (ring buffer -> consumer -> trie -> QtBridge). Nepotrebuje pynput ani displej.
+#
+# Nahrávka (JSON): [{"kind": "press"|"release", "key": "ctrl", "t": 0.0}, ...]
+# t sú sekundy od začiatku nahrávky. Nahrať sa dá cez listener.recording = [] a save_recording().
+
+import json
+import time
+
+from shortcut_manager import KEY_PRESS, KEY_RELEASE
+
+# ////---- Konštanty ----////
+_KINDS = {"press": KEY_PRESS, "release": KEY_RELEASE}
+_KIND_NAMES = {v: k for k, v in _KINDS.items()}
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- SyntheticKey - náhrada za pynput Key / KeyCode ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class SyntheticKey:
+    __slots__ = ("name", "char")
+
+    def __init__(self, name):
+        self.name = name
+        # Jednoznakové klávesy majú char ako pynput KeyCode, ostatné sú "Key.<meno>"
+        self.char = name if len(name) == 1 else None
+
+    def __str__(self):
+        return f"Key.{self.name}"
+
+    def __repr__(self):
+        return f"SyntheticKey({self.name!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, SyntheticKey) and other.name == self.name
+
+    def __hash__(self):
+        return hash(("SyntheticKey", self.name))
+
+# ////---- Interné inštancie (rovnaký kláves = rovnaký objekt, ako pri pynput Key) ----////
+_keys = {}
+
+def synthetic_key(name):
+    key = _keys.get(name)
+    if key is None:
+        key = _keys[name] = SyntheticKey(name)
+    return key
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Generovanie prúdu udalostí ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def combo_events(text, t=0.0, step=0.0):
+    """ "ctrl+k" -> stlačenie ctrl, k, uvoľnenie k, ctrl. Vráti list (druh, SyntheticKey, t)."""
+    names = [n.strip() for n in text.lower().split("+") if n.strip()]
+    events = []
+    for name in names:
+        events.append((KEY_PRESS, synthetic_key(name), t))
+        t += step
+    for name in reversed(names):
+        events.append((KEY_RELEASE, synthetic_key(name), t))
+        t += step
+    return events
+
+def sequence_events(text, step=0.0):
+    """ "ctrl+k ctrl+s" -> udalosti všetkých krokov za sebou"""
+    events, t = [], 0.0
+    for combo in text.split():
+        chunk = combo_events(combo, t, step)
+        events.extend(chunk)
+        t = chunk[-1][2] + step
+    return events
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Nahrávky ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def load_recording(path):
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [(_KINDS[item["kind"]], synthetic_key(item["key"]), float(item.get("t", 0.0))) for item in data]
+
+def save_recording(events, path):
+    """events: list (druh, názov alebo kláves, čas) - napr. listener.recording"""
+    t0 = events[0][2] if events else 0.0
+    data = [{"kind": _KIND_NAMES[kind], "key": getattr(key, "name", key), "t": round(t - t0, 6)}
+            for kind, key, t in events if key]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    print(f"[shortcut_replay] Nahrávka uložená do {path} ({len(data)} udalostí)")
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Prehratie do listenera ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def replay(listener, events, realtime=False, speed=1.0):
+    """Podá udalosti listeneru. realtime=True dodrží časy z nahrávky (delené speed)."""
+    start = time.perf_counter()
+    t0 = events[0][2] if events else 0.0
+    for kind, key, t in events:
+        if realtime:
+            delay = (t - t0) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        listener.inject(kind, key)
+    return len(events)
+# ////-----------------------------------------------------------------------------------------
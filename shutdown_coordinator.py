@@ -0,0 +1,87 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Shutdown Coordinator - ukončenie logík s pevným časovým limitom ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Všetkým modulom sa naraz nastaví stop_event, potom sa na všetky čaká paralelne pod jedným
+# spoločným deadline. Kto ho nestihne, je opustený (proces sa terminuje, async úloha sa zruší,
+# daemon vlákno sa nechá tak). Na konci sa vypíše, koľko trvalo ukončenie každého modulu.
+
+import time
+import threading
+
+# ////---- Konštanty ----////
+SHUTDOWN_DEADLINE = 5.0  # sekundy pre všetky moduly spolu
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Opustenie modulu, ktorý nestihol deadline ----////
+def _abandon(handle):
+    # LogicProcess -> terminate(), AsyncJob -> cancel() úlohy, TickJob -> cancel() (vyradenie
+    # z plánovača), vlákno sa zabiť nedá (je daemon)
+    try:
+        if hasattr(handle, "terminate"):
+            handle.terminate()
+        elif hasattr(handle, "cancel"):
+            handle.cancel()
+    except Exception as e:
+        print(f"[shutdown] Chyba pri opustení modulu {handle.name}: {e}")
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Hlavná funkcia ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def shutdown_logics(stop_events, logic_threads, deadline=SHUTDOWN_DEADLINE):
+    """Zastaví všetky logiky a vráti dict: meno modulu -> čas ukončenia v s (None = opustený)."""
+    start = time.monotonic()
+    end = start + deadline
+
+    # 1) Signál všetkým naraz
+    for stop_event in stop_events:
+        try:
+            stop_event.set()
+        except Exception as e:
+            print(f"[shutdown] Chyba pri nastavení stop_event: {e}")
+
+    # 2) Paralelné čakanie - jedno krátke vlákno na modul, všetky pod spoločným deadline
+    timings = {}
+    lock = threading.Lock()
+    all_done = threading.Event()
+    remaining = [len(logic_threads)]
+
+    def join_one(handle):
+        try:
+            handle.join(timeout=max(0.0, end - time.monotonic()))
+        except Exception as e:
+            print(f"[shutdown] Chyba pri čakaní na modul {handle.name}: {e}")
+        with lock:
+            if not handle.is_alive():
+                timings[handle.name] = time.monotonic() - start
+            remaining[0] -= 1
+            if remaining[0] <= 0:
+                all_done.set()
+
+    if logic_threads:
+        for handle in logic_threads:
+            threading.Thread(target=join_one, args=(handle,), name=f"shutdown:{handle.name}", daemon=True).start()
+        all_done.wait(max(0.0, end - time.monotonic()))
+
+    # 3) Kto nestihol deadline, je opustený
+    report = {}
+    for handle in logic_threads:
+        with lock:
+            elapsed = timings.get(handle.name)
+        if elapsed is None and not handle.is_alive():
+            elapsed = time.monotonic() - start  # dobehol tesne po deadline
+        if elapsed is None:
+            _abandon(handle)
+        report[handle.name] = elapsed
+
+    # 4) Report - opustené a najpomalšie moduly navrchu
+    total = time.monotonic() - start
+    print(f"[shutdown] Ukončenie logík trvalo {total:.3f} s (limit {deadline:.1f} s)")
+    # Opustené (None) sú vždy prvé, za nimi ostatné od najpomalšieho
+    for name, elapsed in sorted(report.items(), key=lambda kv: (kv[1] is not None, -(kv[1] or 0))):
+        if elapsed is None:
+            print(f"[shutdown]   {name}: NESTIHOL deadline, opustený")
+        else:
+            print(f"[shutdown]   {name}: {elapsed * 1000:.1f} ms")
+    return report
+# ////-----------------------------------------------------------------------------------------
@@ -0,0 +1,94 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Startup Profiler - časová os štartu v Chrome trace formáte ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Zapína sa parametrom --profile-startup[=cesta.json]. Merané úseky (span) sa zapíšu ako
+# Chrome trace JSON, ktorý otvorí chrome://tracing, ui.perfetto.dev aj speedscope.app.
+# Ak profiler nie je zapnutý, span() je prázdny context manager bez merania.
+
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager
+
+# ////---- Stav profilera ----////
+DEFAULT_TRACE_PATH = "startup_trace.json"
+_enabled = False
+_trace_path = DEFAULT_TRACE_PATH
+_events = []
+_lock = threading.Lock()
+_t0_ns = time.perf_counter_ns()
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Zapnutie ----////
+def enable(path=None):
+    global _enabled, _trace_path
+    _enabled = True
+    if path:
+        _trace_path = path
+
+def is_enabled():
+    return _enabled
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Meranie úseku ----////
+@contextmanager
+def span(name, category="startup", **args):
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        end = time.perf_counter_ns()
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",  # complete event (začiatok + trvanie)
+            "ts": (start - _t0_ns) / 1000,  # mikrosekundy
+            "dur": (end - start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        with _lock:
+            _events.append(event)
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Dekorátor - celá funkcia ako jeden úsek ----////
+def profiled(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+# ////-----------------------------------------------------------------------------------------
+
+# ////---- Zápis trace súboru ----////
+def write_trace(path=None):
+    if not _enabled:
+        return None
+    path = path or _trace_path
+    pid = os.getpid()
+    # Metadata: mená vlákien, aby bolo v prehliadači vidno "MainThread", "logic-tick_0"...
+    names = {t.ident: t.name for t in threading.enumerate()}
+    with _lock:
+        events = list(_events)
+    tids = {e["tid"] for e in events}
+    meta = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+             "args": {"name": names.get(tid, str(tid))}} for tid in tids]
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": meta + events, "displayTimeUnit": "ms"}, f)
+        print(f"[startup_profiler] Trace uložený do {path} ({len(events)} úsekov)")
+    except OSError as e:
+        print(f"[startup_profiler] Trace sa nepodarilo uložiť: {e}")
+    return path
+# ////-----------------------------------------------------------------------------------------
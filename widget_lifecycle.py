@@ -0,0 +1,95 @@
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Widget Lifecycle - uspanie skrytých widgetov a overlayov ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# Loader volá suspend(widget) keď widget prestane byť viditeľný (F9, prepnutie modulu, koniec
+# edit režimu) a resume(widget) keď sa znova zobrazí. Widget (BaseWidget aj overlay widget)
+# môže mať metódy on_suspend() / on_resume() - obe sú voliteľné, volajú sa iba pri zmene stavu.
+#
+# LifecycleTimer je QTimer, ktorý sa pri suspend sám zastaví a pri resume znova spustí
+# (iba ak bežal). Stačí ho vytvoriť s widgetom ako rodičom:
+#   self.timer = LifecycleTimer(self, 1000, self.refresh); self.timer.start()
+
+from PySide6.QtCore import QTimer
+
+# ////---- Konštanty ----////
+SUSPENDED_ATTR = "_lifecycle_suspended"
+# ////-----------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- LifecycleTimer ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+class LifecycleTimer(QTimer):
+    def __init__(self, parent, interval=None, callback=None, single_shot=False):
+        super().__init__(parent)
+        self._wanted = False  # widget chce, aby timer bežal (start bez stop)
+        self._paused = is_suspended(parent)
+        # _finished musí bežať pred callbackom - callback môže timer znova naplánovať (start)
+        self.timeout.connect(self._finished)
+        if interval is not None:
+            self.setInterval(interval)
+        self.setSingleShot(single_shot)
+        if callback is not None:
+            self.timeout.connect(callback)
+
+    # ////---- Štart a stop z widgetu ----////
+    def start(self, *args):
+        self._wanted = True
+        if args:
+            self.setInterval(args[0])
+        if not self._paused:
+            super().start()
+
+    def stop(self):
+        self._wanted = False
+        super().stop()
+
+    def _finished(self):
+        if self.isSingleShot():
+            self._wanted = False  # single shot už vypršal, pri resume sa nespúšťa znova
+    # ////-------------------------------------------------------------------------------------
+
+    # ////---- Uspanie a prebudenie (volá suspend/resume) ----////
+    def pause(self):
+        self._paused = True
+        super().stop()
+
+    def unpause(self):
+        self._paused = False
+        if self._wanted and not self.isActive():
+            super().start()
+    # ////-------------------------------------------------------------------------------------
+
+# /////////////////////////////////////////////////////////////////////////////////////////////
+# ////---- Uspanie a prebudenie widgetu ----////
+# /////////////////////////////////////////////////////////////////////////////////////////////
+def is_suspended(widget):
+    return getattr(widget, SUSPENDED_ATTR, False)
+
+def suspend(widget):
+    _set_suspended(widget, True)
+
+def resume(widget):
+    _set_suspended(widget, False)
+
+def set_active(widget, active):
+    _set_suspended(widget, not active)
+
+def _set_suspended(widget, state):
+    if widget is None or is_suspended(widget) == state:
+        return  # opakované hide/show nič nerobí
+    try:
+        setattr(widget, SUSPENDED_ATTR, state)
+    except AttributeError:
+        return  # objekt bez __dict__ (nie widget) - nemá čo uspať
+    hook = getattr(widget, "on_suspend" if state else "on_resume", None)
+    if hook is not None:
+        try:
+            hook()
+        except Exception as e:
+            print(f"[widget_lifecycle] Chyba v {'on_suspend' if state else 'on_resume'} "
+                  f"widgetu {type(widget).__name__}: {e}")
+    find = getattr(widget, "findChildren", None)
+    if find is not None:
+        for timer in find(LifecycleTimer):
+            timer.pause() if state else timer.unpause()
+# ////-----------------------------------------------------------------------------------------